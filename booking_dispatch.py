@@ -9,61 +9,107 @@ Features:
 """
 
 import asyncio
-import html
 import logging
-from typing import Optional
+import random
+from typing import NamedTuple, Optional
 
-from aiogram import Router, Bot, F
+from aiogram import Router, Bot
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.filters.callback_data import CallbackData
 
 from config import ADMINS
 import db_postgres as db
+from utils import h, spawn
 
 logger = logging.getLogger(__name__)
 
 booking_dispatch_router = Router(name="booking_dispatch")
 
+
+class BookingAction(CallbackData, prefix="bk"):
+    """Owner accept/reject button: bk:<ok|no>:<booking short id>."""
+    action: str
+    bid: str
+
+
 # Background task reference
 _timeout_task: Optional[asyncio.Task] = None
 _bot_ref: Optional[Bot] = None
 
+# Per-owner FIFO: bookings for the same partner chat are sent one at a time,
+# so a burst of confirms doesn't trip Telegram's per-chat flood limit.
+_owner_locks: dict[int, asyncio.Lock] = {}
+
+# Backpressure: new confirms are held while an owner has more than
+# OWNER_QUEUE_LIMIT booking DMs waiting to be delivered.
+OWNER_QUEUE_LIMIT = 3
+_owner_pending: dict[int, int] = {}
+_owner_saturated: set[int] = set()
+
+# Bot-wide cap on in-flight outbound sends, so a burst of dispatches queues
+# here instead of opening dozens of concurrent requests. This bounds
+# concurrency, not rate: Telegram's ~30 msg/s limit is handled by the
+# RetryAfter retry in safe_send_html.
+_send_slots = asyncio.Semaphore(30)
+
 
 # =============================================================================
-# HTML Safety
+# Safe Sending
 # =============================================================================
 
-def h(text) -> str:
-    """HTML-escape any value."""
-    if text is None:
-        return ""
-    return html.escape(str(text), quote=False)
+async def _send_message(bot: Bot, **kwargs):
+    """bot.send_message under the global outbound concurrency cap."""
+    async with _send_slots:
+        return await bot.send_message(**kwargs)
 
 
 async def safe_send_html(bot: Bot, chat_id: int, text: str, reply_markup=None) -> Optional[int]:
     """Send HTML message with fallback. Returns message_id or None."""
     try:
-        msg = await bot.send_message(
+        msg = await _send_message(
+            bot,
             chat_id=chat_id,
             text=text,
             parse_mode="HTML",
             reply_markup=reply_markup,
+            disable_web_page_preview=True,
         )
         return msg.message_id
     except TelegramBadRequest as e:
         if "can't parse entities" in str(e).lower():
             try:
-                msg = await bot.send_message(
+                msg = await _send_message(
+                    bot,
                     chat_id=chat_id,
                     text=text,
                     parse_mode=None,
                     reply_markup=reply_markup,
+                    disable_web_page_preview=True,
                 )
                 return msg.message_id
             except Exception:
                 pass
         logger.error(f"Failed to send message to {chat_id}: {e}")
         return None
+    except TelegramRetryAfter as e:
+        # Flood limit hit: wait as instructed, then retry once. The jitter keeps
+        # concurrent senders that hit the same limit from retrying in lockstep.
+        logger.warning(f"Flood limit for {chat_id}, retrying in {e.retry_after}s")
+        await asyncio.sleep(e.retry_after + random.uniform(0, 1))
+        try:
+            msg = await _send_message(
+                bot,
+                chat_id=chat_id,
+                text=text,
+                parse_mode="HTML",
+                reply_markup=reply_markup,
+                disable_web_page_preview=True,
+            )
+            return msg.message_id
+        except Exception as e2:
+            logger.error(f"Failed to send message to {chat_id} after retry: {e2}")
+            return None
     except Exception as e:
         logger.error(f"Error sending to {chat_id}: {e}")
         return None
@@ -115,46 +161,68 @@ def _get_owner_id(booking: dict) -> int:
 # Dispatch to Owner (Partner)
 # =============================================================================
 
-async def dispatch_booking_to_owner(bot: Bot, booking_id: str) -> bool:
+OWNER_DM_TEMPLATE = (
+    "📬 <b>Sizga zakaz keldi!</b>\nQabul qilasizmi?\n\n"
+    "{summary}\n\n"
+    "⏳ 5 daqiqa ichida javob bering!"
+)
+
+
+async def dispatch_booking_to_owner(bot: Bot, booking: dict) -> bool:
     """
     Send booking details to the listing OWNER for accept/reject.
     Uses mark_booking_dispatched() to atomically set status, dispatched_at, and partner_message_id.
     On failure (owner unreachable), immediately alerts admins.
     """
-    booking = await db.get_booking(booking_id)
-    if not booking:
-        logger.error(f"Booking {booking_id} not found for owner dispatch")
-        return False
-
+    booking_id = booking["id"]
     owner_id = _get_owner_id(booking)
     if not owner_id:
         logger.error(f"No owner for booking {booking_id}")
         return False
 
-    text = _build_booking_text(
-        booking,
-        prefix="📬 <b>Sizga zakaz keldi!</b>\nQabul qilasizmi?\n",
-    )
-    text += "\n\n⏳ 5 daqiqa ichida javob bering!"
+    short_id = booking_id[:8]
+    text = OWNER_DM_TEMPLATE.format_map({"summary": _build_booking_text(booking)})
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="✅ Qabul qilish", callback_data=f"bk:ok:{booking_id[:8]}"),
-            InlineKeyboardButton(text="❌ Rad etish", callback_data=f"bk:no:{booking_id[:8]}"),
+            InlineKeyboardButton(text="✅ Qabul qilish", callback_data=BookingAction(action="ok", bid=short_id).pack()),
+            InlineKeyboardButton(text="❌ Rad etish", callback_data=BookingAction(action="no", bid=short_id).pack()),
         ]
     ])
 
-    message_id = await safe_send_html(bot, owner_id, text, keyboard)
+    _owner_pending[owner_id] = _owner_pending.get(owner_id, 0) + 1
+    if _owner_pending[owner_id] > OWNER_QUEUE_LIMIT and owner_id not in _owner_saturated:
+        _owner_saturated.add(owner_id)
+        logger.warning(f"Backpressure start: owner {owner_id} has {_owner_pending[owner_id]} pending DMs")
+    try:
+        async with _owner_locks.setdefault(owner_id, asyncio.Lock()):
+            message_id = await safe_send_html(bot, owner_id, text, keyboard)
+    finally:
+        _owner_pending[owner_id] -= 1
+        if not _owner_pending[owner_id]:
+            del _owner_pending[owner_id]
+        if owner_id in _owner_saturated and owner_queue_depth(owner_id) <= OWNER_QUEUE_LIMIT:
+            _owner_saturated.discard(owner_id)
+            logger.info(f"Backpressure end: owner {owner_id}")
 
     if message_id:
         # Atomic: set status=sent, dispatched_at=NOW(), partner_message_id
         await db.mark_booking_dispatched(booking_id, message_id)
-        logger.info(f"Booking {booking_id[:8]} dispatched to owner {owner_id}")
+        logger.info(f"Booking {short_id} dispatched to owner {owner_id}")
         return True
 
     # --- Owner unreachable: bot blocked or never started ---
-    logger.warning(f"Owner {owner_id} unreachable for booking {booking_id[:8]}")
+    logger.warning(f"Owner {owner_id} unreachable for booking {short_id}")
 
+    # Admin alert (owner lookup + N sends) isn't needed to report the
+    # failure, so it runs in the background
+    spawn(_alert_admins_owner_unreachable(bot, booking, owner_id))
+
+    return False
+
+
+async def _alert_admins_owner_unreachable(bot: Bot, booking: dict, owner_id: int) -> None:
+    """Tell admins to phone a partner who can't be reached via the bot."""
     # Try to get owner contact info for admin alert
     owner_info = await db.get_user_by_telegram_id(owner_id)
     owner_phone = owner_info.get("phone", "—") if owner_info else "—"
@@ -163,35 +231,33 @@ async def dispatch_booking_to_owner(bot: Bot, booking_id: str) -> bool:
         owner_name = f"{owner_info.get('first_name', '')} {owner_info.get('last_name', '')}".strip()
     owner_name = owner_name or "—"
 
+    alert = (
+        f"🚫 <b>Partner topilmadi / bot bloklangan!</b>\n\n"
+        f"📌 {h(booking.get('listing_title', ''))}\n"
+        f"👤 Partner: {h(owner_name)}\n"
+        f"🆔 TG ID: <code>{owner_id}</code>\n"
+        f"📱 Telefon: {h(owner_phone)}\n\n"
+        f"📞 <b>Iltimos, partnerga telefon qiling!</b>"
+    )
     for admin_id in ADMINS:
-        await safe_send_html(
-            bot,
-            admin_id,
-            f"🚫 <b>Partner topilmadi / bot bloklangan!</b>\n\n"
-            f"📌 {h(booking.get('listing_title', ''))}\n"
-            f"👤 Partner: {h(owner_name)}\n"
-            f"🆔 TG ID: <code>{owner_id}</code>\n"
-            f"📱 Telefon: {h(owner_phone)}\n\n"
-            f"📞 <b>Iltimos, partnerga telefon qiling!</b>",
-        )
+        await safe_send_html(bot, admin_id, alert)
 
-    return False
+
+def owner_queue_depth(owner_id: int) -> int:
+    """Number of booking DMs queued or in flight for this owner."""
+    return _owner_pending.get(owner_id, 0)
 
 
 # =============================================================================
 # Dispatch Monitoring Copy to Admins
 # =============================================================================
 
-async def dispatch_booking_to_admins(bot: Bot, booking_id: str, status: str = "PENDING_PARTNER") -> None:
+async def dispatch_booking_to_admins(bot: Bot, booking: dict, status: str = "PENDING_PARTNER") -> None:
     """Send a monitoring copy of the booking to all ADMINS (no action buttons)."""
-    booking = await db.get_booking(booking_id)
-    if not booking:
-        return
-
     owner_id = _get_owner_id(booking)
     text = _build_booking_text(
         booking,
-        prefix=f"📋 <b>Yangi bron (monitoring)</b>\n🔖 Status: {h(status)}\n👤 Partner: <code>{owner_id}</code>\n",
+        prefix=f"📋 <b>Yangi bron (monitoring)</b>\n🔖 Status: {status}\n👤 Partner: <code>{owner_id}</code>\n",
     )
 
     for admin_id in ADMINS:
@@ -202,173 +268,166 @@ async def dispatch_booking_to_admins(bot: Bot, booking_id: str, status: str = "P
 
 
 # =============================================================================
-# Owner Accept/Reject Callbacks (NO AdminFilter — owner can be non-admin)
+# Background Dispatch (user reply is not blocked on partner delivery)
 # =============================================================================
 
-@booking_dispatch_router.callback_query(F.data.startswith("bk:ok:"))
-async def accept_booking(callback: CallbackQuery, bot: Bot):
-    """Owner accepts booking. Uses atomic DB update to prevent race conditions."""
-    bid_short = callback.data.split(":")[2]
-    booking = await find_booking_by_short_id(bid_short)
-
-    if not booking:
-        await callback.answer("Bron topilmadi", show_alert=True)
-        return
-
-    # Security: only the owner can accept
-    owner_id = _get_owner_id(booking)
-    if not owner_id or callback.from_user.id != owner_id:
-        await callback.answer("⛔ Faqat egasi qabul qilishi mumkin", show_alert=True)
-        return
-
-    # Check if already processed (show informative message)
-    if booking["status"] not in ("pending_partner", "sent"):
-        status_text = {
-            "accepted": "allaqachon qabul qilingan",
-            "rejected": "allaqachon rad etilgan",
-            "timeout": "vaqti o'tgan",
-        }.get(booking["status"], booking["status"])
-        await callback.answer(f"Bu bron {status_text}", show_alert=True)
-        return
-
-    # Atomic accept: WHERE id=? AND status IN (...) AND owner_user_id=?
-    # Returns False if another handler already changed the status (race condition)
-    success = await db.accept_booking_atomic(booking["id"], owner_id)
-
-    if not success:
-        await callback.answer("Bu bron allaqachon jarayonda", show_alert=True)
-        return
-
-    await callback.answer("✅ Qabul qilindi!")
-
-    # Edit partner message — remove buttons
-    try:
-        await callback.message.edit_text(
-            callback.message.text + "\n\n✅ <b>Qabul qilindi!</b>",
-            parse_mode="HTML",
-        )
-    except Exception:
-        pass
-
-    # Notify user
-    user_id = booking["user_telegram_id"]
-    await safe_send_html(
-        bot,
-        user_id,
-        f"✅ <b>Bron tasdiqlandi!</b>\n\n"
-        f"📌 {h(booking.get('listing_title', ''))}\n\n"
-        f"Tez orada siz bilan bog'lanishadi.",
+async def _dispatch_booking(bot: Bot, booking: dict, user_id: int) -> None:
+    """Deliver a new booking to owner + admins; tell the user if the owner is unreachable."""
+    booking_id = booking["id"]
+    # The monitoring copy doesn't depend on the owner DM (which may wait
+    # behind that owner's queue), so both go out concurrently.
+    success, admins_result = await asyncio.gather(
+        dispatch_booking_to_owner(bot, booking),
+        dispatch_booking_to_admins(bot, booking),
+        return_exceptions=True,
     )
+    if isinstance(admins_result, Exception):
+        logger.error(f"Admin copy failed for booking {booking_id[:8]}: {admins_result}")
+    if isinstance(success, Exception):
+        logger.error(f"Dispatch failed for booking {booking_id[:8]}: {success}", exc_info=success)
+        await db.update_booking_status(booking_id, "notify_failed")
+        success = False
 
-    # Notify admins
-    for admin_id in ADMINS:
-        if owner_id and admin_id == owner_id:
-            continue
+    if not success:
         await safe_send_html(
             bot,
-            admin_id,
-            f"✅ Bron <b>qabul qilindi</b>\n"
-            f"📌 {h(booking.get('listing_title', ''))}\n"
-            f"👤 Partner: <code>{owner_id}</code>",
+            user_id,
+            "⚠️ <b>Bron saqlandi</b>, lekin partnerni topmadik.\n\n"
+            "Tez orada siz bilan bog'lanamiz.",
         )
 
-    logger.info(f"Booking {booking['id'][:8]} accepted by owner {owner_id}")
 
+def schedule_booking_dispatch(bot: Bot, booking: dict, user_id: int) -> None:
+    """Dispatch a freshly created booking (as returned by create_booking) without blocking the calling handler."""
+    spawn(_dispatch_booking(bot, booking, user_id))
 
-@booking_dispatch_router.callback_query(F.data.startswith("bk:no:"))
-async def reject_booking(callback: CallbackQuery, bot: Bot):
-    """Owner rejects booking. Uses atomic DB update to prevent race conditions."""
-    bid_short = callback.data.split(":")[2]
-    booking = await find_booking_by_short_id(bid_short)
+
+# =============================================================================
+# Owner Accept/Reject Callbacks (NO AdminFilter — owner can be non-admin)
+# =============================================================================
+
+class _OwnerAction(NamedTuple):
+    """Status and texts for one owner accept/reject button."""
+    new_status: str
+    not_owner_text: str   # alert when someone else presses the button
+    toast: str            # callback answer for the owner
+    partner_suffix: str   # appended to the partner's booking message
+    user_text: str        # to the guest; {title}
+    admin_text: str       # monitoring copy; {title}, {owner_id}
+
+
+_OWNER_ACTIONS = {
+    "ok": _OwnerAction(
+        new_status="accepted",
+        not_owner_text="⛔ Faqat egasi qabul qilishi mumkin",
+        toast="✅ Qabul qilindi!",
+        partner_suffix="\n\n✅ <b>Qabul qilindi!</b>",
+        user_text="✅ <b>Bron tasdiqlandi!</b>\n\n📌 {title}\n\nTez orada siz bilan bog'lanishadi.",
+        admin_text="✅ Bron <b>qabul qilindi</b>\n📌 {title}\n👤 Partner: <code>{owner_id}</code>",
+    ),
+    "no": _OwnerAction(
+        new_status="rejected",
+        not_owner_text="⛔ Faqat egasi rad etishi mumkin",
+        toast="❌ Rad etildi",
+        partner_suffix="\n\n❌ <b>Rad etildi</b>",
+        user_text="❌ <b>Bron rad etildi</b>\n\n📌 {title}\n\nBoshqa variantlarni ko'rish: /browse",
+        admin_text="❌ Bron <b>rad etildi</b>\n📌 {title}\n👤 Partner: <code>{owner_id}</code>",
+    ),
+}
+
+_PROCESSED_STATUS_TEXT = {
+    "accepted": "allaqachon qabul qilingan",
+    "rejected": "allaqachon rad etilgan",
+    "timeout": "vaqti o'tgan",
+}
+
+
+@booking_dispatch_router.callback_query(BookingAction.filter())
+async def owner_booking_action(callback: CallbackQuery, callback_data: BookingAction, bot: Bot):
+    """Owner accepts/rejects booking. Uses atomic DB update to prevent race conditions."""
+    action = _OWNER_ACTIONS.get(callback_data.action)
+    if not action:
+        await callback.answer()
+        return
+
+    # Lookup + atomic status update in one round trip; the update only
+    # applies if the presser is the owner and the booking is still pending,
+    # so a concurrent accept/reject can't both succeed.
+    booking, success = await db.decide_booking(
+        callback_data.bid, callback.from_user.id, action.new_status,
+    )
 
     if not booking:
         await callback.answer("Bron topilmadi", show_alert=True)
         return
 
-    # Security: only the owner can reject
+    # Security: only the owner can accept/reject
     owner_id = _get_owner_id(booking)
     if not owner_id or callback.from_user.id != owner_id:
-        await callback.answer("⛔ Faqat egasi rad etishi mumkin", show_alert=True)
+        await callback.answer(action.not_owner_text, show_alert=True)
         return
 
+    # Check if already processed (show informative message)
     if booking["status"] not in ("pending_partner", "sent"):
-        await callback.answer("Bu bron allaqachon jarayonda", show_alert=True)
+        status_text = _PROCESSED_STATUS_TEXT.get(booking["status"], booking["status"])
+        await callback.answer(f"Bu bron {status_text}", show_alert=True)
         return
 
-    # Atomic reject
-    success = await db.reject_booking_atomic(booking["id"], owner_id)
-
     if not success:
         await callback.answer("Bu bron allaqachon jarayonda", show_alert=True)
         return
 
-    await callback.answer("❌ Rad etildi")
-
-    # Edit partner message — remove buttons
-    try:
-        await callback.message.edit_text(
-            callback.message.text + "\n\n❌ <b>Rad etildi</b>",
+    title = h(booking.get("listing_title", ""))
+    admin_msg = action.admin_text.format(title=title, owner_id=owner_id)
+
+    # Toast, partner message edit (removes buttons), user and admin
+    # notifications are independent — send them concurrently.
+    # return_exceptions: a failed edit (e.g. message too old) must not
+    # cancel the notifications.
+    await asyncio.gather(
+        callback.answer(action.toast),
+        callback.message.edit_text(
+            callback.message.text + action.partner_suffix,
             parse_mode="HTML",
-        )
-    except Exception:
-        pass
-
-    # Notify user
-    user_id = booking["user_telegram_id"]
-    await safe_send_html(
-        bot,
-        user_id,
-        f"❌ <b>Bron rad etildi</b>\n\n"
-        f"📌 {h(booking.get('listing_title', ''))}\n\n"
-        f"Boshqa variantlarni ko'rish: /browse",
+        ),
+        safe_send_html(bot, booking["user_telegram_id"], action.user_text.format(title=title)),
+        *(
+            safe_send_html(bot, admin_id, admin_msg)
+            for admin_id in ADMINS
+            if not (owner_id and admin_id == owner_id)
+        ),
+        return_exceptions=True,
     )
 
-    # Notify admins
-    for admin_id in ADMINS:
-        if owner_id and admin_id == owner_id:
-            continue
-        await safe_send_html(
-            bot,
-            admin_id,
-            f"❌ Bron <b>rad etildi</b>\n"
-            f"📌 {h(booking.get('listing_title', ''))}\n"
-            f"👤 Partner: <code>{owner_id}</code>",
-        )
+    logger.info(f"Booking {booking['id'][:8]} {action.new_status} by owner {owner_id}")
 
-    logger.info(f"Booking {booking['id'][:8]} rejected by owner {owner_id}")
 
+# =============================================================================
+# Timeout Checker Background Task
+# =============================================================================
 
-async def find_booking_by_short_id(bid_short: str) -> Optional[dict]:
-    """Find booking by short ID prefix."""
-    if not db._pool:
-        return None
+TIMEOUT_BACKOFF_MAX = 300  # seconds
 
-    try:
-        async with db._pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT b.id, b.listing_id, b.user_telegram_id, b.payload,
-                       b.status, b.expires_at, b.created_at,
-                       b.owner_user_id, b.partner_message_id,
-                       l.title as listing_title, l.category, l.telegram_admin_id,
-                       l.price_from, l.currency
-                FROM bookings b
-                JOIN listings l ON b.listing_id = l.id
-                WHERE b.id::text LIKE $1
-                """,
-                bid_short + "%",
-            )
-            if row:
-                return db._row_to_booking(row)
-    except Exception as e:
-        logger.error(f"Error finding booking: {e}")
 
-    return None
+MESSAGE_TEXT_LIMIT = 4000  # Telegram allows 4096 characters per message
 
 
-# =============================================================================
-# Timeout Checker Background Task
-# =============================================================================
+def _pack_messages(parts: list[str], sep: str = "\n\n➖➖➖\n\n") -> list[str]:
+    """Join parts into as few messages as fit under MESSAGE_TEXT_LIMIT."""
+    messages = []
+    for part in parts:
+        if messages and len(messages[-1]) + len(sep) + len(part) <= MESSAGE_TEXT_LIMIT:
+            messages[-1] += sep + part
+        else:
+            messages.append(part)
+    return messages
+
+
+async def _send_in_order(bot: Bot, chat_id: int, texts: list[str]) -> None:
+    """Send texts to one chat one after another, never concurrently."""
+    for text in texts:
+        await safe_send_html(bot, chat_id, text)
+
 
 async def timeout_checker_loop(bot: Bot):
     """
@@ -381,50 +440,65 @@ async def timeout_checker_loop(bot: Bot):
 
     logger.info("Timeout checker started")
 
+    failures = 0
     while True:
         try:
             await asyncio.sleep(30)
 
             expired = await db.fetch_expired_bookings()
 
+            # The expired rows already carry everything the messages need (one
+            # UPDATE ... RETURNING). Users get one message each, concurrently;
+            # admins get the sweep's alerts combined, since N separate alerts
+            # to one chat at once would trip Telegram's per-chat flood limit.
+            sends = []
+            alerts = []
             for booking in expired:
                 user_id = booking["user_telegram_id"]
-                title = booking.get("listing_title", "")
+                title = h(booking.get("listing_title", ""))
                 owner_id = booking.get("owner_user_id", 0)
                 owner_phone = booking.get("owner_phone") or "—"
                 owner_name = f"{booking.get('owner_first_name', '')} {booking.get('owner_last_name', '')}".strip() or "—"
 
                 # Notify user
-                await safe_send_html(
+                sends.append(safe_send_html(
                     bot,
                     user_id,
                     f"⏰ <b>Vaqt tugadi</b>\n\n"
-                    f"📌 {h(title)}\n\n"
+                    f"📌 {title}\n\n"
                     f"Javob bo'lmadi, keyinroq urinib ko'ring.\n"
                     f"/browse - Boshqa variantlar",
-                )
+                ))
 
                 # Notify admins: partner didn't respond — call them
-                for admin_id in ADMINS:
-                    await safe_send_html(
-                        bot,
-                        admin_id,
-                        f"⚠️ <b>Partner javob bermadi!</b>\n\n"
-                        f"📌 {h(title)}\n"
-                        f"👤 Partner: {h(owner_name)}\n"
-                        f"🆔 TG ID: <code>{owner_id}</code>\n"
-                        f"📱 Telefon: {h(owner_phone)}\n\n"
-                        f"📞 <b>Iltimos, partnerga telefon qiling!</b>",
-                    )
+                alert = (
+                    f"⚠️ <b>Partner javob bermadi!</b>\n\n"
+                    f"📌 {title}\n"
+                    f"👤 Partner: {h(owner_name)}\n"
+                    f"🆔 TG ID: <code>{owner_id}</code>\n"
+                    f"📱 Telefon: {h(owner_phone)}\n\n"
+                    f"📞 <b>Iltimos, partnerga telefon qiling!</b>"
+                )
+                alerts.append(alert)
 
                 logger.info(f"Booking {booking['id'][:8]} timed out, owner={owner_id}")
 
+            if alerts:
+                admin_texts = _pack_messages(alerts)
+                sends.extend(_send_in_order(bot, admin_id, admin_texts) for admin_id in ADMINS)
+                await asyncio.gather(*sends, return_exceptions=True)
+
+            failures = 0
+
         except asyncio.CancelledError:
             logger.info("Timeout checker cancelled")
             break
         except Exception as e:
-            logger.error(f"Error in timeout checker: {e}")
-            await asyncio.sleep(5)
+            # Exponential backoff with jitter while the DB/Telegram keep failing
+            delay = min(TIMEOUT_BACKOFF_MAX, 5 * 2 ** failures) * random.uniform(0.5, 1.5)
+            failures += 1
+            logger.error(f"Error in timeout checker (attempt {failures}, retry in {delay:.1f}s): {e}")
+            await asyncio.sleep(delay)
 
 
 def start_timeout_checker(bot: Bot) -> asyncio.Task:
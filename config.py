@@ -8,6 +8,7 @@ In production, prefer real environment variables.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # IMPORTANT: override=False ensures Railway/system env vars take precedence
@@ -15,25 +16,19 @@ from dotenv import load_dotenv
 load_dotenv(override=False)
 
 
+@lru_cache(maxsize=1)
 def get_startup_info() -> str:
     """
-    Get one-line startup info for logging.
+    Get one-line startup info for logging (computed once).
     Returns: "Python X.Y.Z | git:abc1234 | mode:polling"
     """
     import sys
-    import subprocess
 
     python_ver = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
 
-    # Try to get git commit (safe to fail)
-    try:
-        git_sha = subprocess.check_output(
-            ["git", "rev-parse", "--short", "HEAD"],
-            stderr=subprocess.DEVNULL,
-            timeout=2
-        ).decode().strip()
-    except Exception:
-        git_sha = "unknown"
+    # Baked in at build time (docker build --build-arg GIT_SHA=...); Railway
+    # provides its own commit variable. No git binary needed at runtime.
+    git_sha = os.getenv("GIT_SHA") or os.getenv("RAILWAY_GIT_COMMIT_SHA", "")[:7] or "unknown"
 
     mode = "webhook" if os.getenv("WEBHOOK_URL") else "polling"
 
@@ -56,7 +51,8 @@ def _require_env(name: str) -> str:
 BOT_TOKEN: str = _require_env("BOT_TOKEN")
 
 _admins_raw = os.getenv("ADMINS", "").strip()
-ADMINS: list[int] = [int(x.strip()) for x in _admins_raw.split(",") if x.strip().isdigit()]
+# frozenset: `user_id in ADMINS` runs on every admin-gated update
+ADMINS: frozenset[int] = frozenset(int(x) for x in _admins_raw.split(",") if x.strip().isdigit())
 if not ADMINS:
     raise RuntimeError(
         "❌ ADMINS environment variable is empty/invalid. "
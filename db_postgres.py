@@ -14,14 +14,28 @@ import html
 import json
 import logging
 import os
+import re
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional
 from uuid import UUID
 
+# orjson (optional) encodes/decodes json(b) columns several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Global pool
 _pool = None
+# Dedicated connection LISTENing for listing changes (outside the pool)
+_listen_conn = None
+# Reconnect loop for _listen_conn after it drops
+_listen_task: Optional[asyncio.Task] = None
+LISTEN_RECONNECT_MAX = 60  # seconds between reconnect attempts, at most
 
 
 # =============================================================================
@@ -39,6 +53,26 @@ def get_database_url() -> str:
     return url
 
 
+def get_pool_sizes() -> tuple[int, int]:
+    """Get (min_size, max_size) for the pool from DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE."""
+    sizes = []
+    for name, default in (("DB_POOL_MIN_SIZE", 10), ("DB_POOL_MAX_SIZE", 25)):
+        raw = os.getenv(name, "").strip()
+        if raw.isdigit() and int(raw) > 0:
+            sizes.append(int(raw))
+        else:
+            if raw:
+                logger.warning(f"Invalid {name}={raw!r}, using {default}")
+            sizes.append(default)
+    min_size, max_size = sizes
+    return min(min_size, max_size), max_size
+
+
+def uses_pgbouncer() -> bool:
+    """True when DB_PGBOUNCER=true (DATABASE_URL points at PgBouncer in transaction mode)."""
+    return os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+
 def get_ssl_context():
     """Get SSL context for Railway PostgreSQL."""
     import ssl
@@ -61,38 +95,6 @@ def get_ssl_context():
 # Schema Migration - FULLY IDEMPOTENT
 # =============================================================================
 
-async def _table_exists(conn, table_name: str) -> bool:
-    """Check if a table exists."""
-    result = await conn.fetchval(
-        """
-        SELECT EXISTS (
-            SELECT FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name = $1
-        )
-        """,
-        table_name,
-    )
-    return result
-
-
-async def _column_exists(conn, table_name: str, column_name: str) -> bool:
-    """Check if a column exists in a table."""
-    result = await conn.fetchval(
-        """
-        SELECT EXISTS (
-            SELECT FROM information_schema.columns 
-            WHERE table_schema = 'public' 
-            AND table_name = $1 
-            AND column_name = $2
-        )
-        """,
-        table_name,
-        column_name,
-    )
-    return result
-
-
 async def _constraint_exists(conn, constraint_name: str) -> bool:
     """Check if a constraint exists."""
     result = await conn.fetchval(
@@ -108,37 +110,56 @@ async def _constraint_exists(conn, constraint_name: str) -> bool:
     return result
 
 
-async def _index_exists(conn, index_name: str) -> bool:
-    """Check if an index exists."""
-    result = await conn.fetchval(
+async def _load_columns(conn) -> set[tuple[str, str]]:
+    """All (table, column) pairs in the public schema, in one catalog query."""
+    rows = await conn.fetch(
+        """
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
         """
-        SELECT EXISTS (
-            SELECT FROM pg_indexes 
-            WHERE schemaname = 'public' 
-            AND indexname = $1
-        )
-        """,
-        index_name,
     )
-    return result
+    return {(r["table_name"], r["column_name"]) for r in rows}
 
 
-async def _add_column_if_not_exists(conn, table: str, column: str, definition: str):
-    """Add a column if it doesn't exist."""
-    if not await _column_exists(conn, table, column):
-        await conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
-        logger.info(f"Added column {table}.{column}")
+async def _add_column_if_not_exists(conn, table: str, column: str, definition: str, existing: set = None):
+    """
+    Add a column if it doesn't exist.
+    With `existing` (from _load_columns) present columns are skipped locally:
+    even a no-op ADD COLUMN IF NOT EXISTS takes an exclusive table lock.
+    """
+    if existing is not None:
+        if (table, column) in existing:
+            return
+        existing.add((table, column))
+    await conn.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {definition}")
+    logger.info(f"Added column {table}.{column}")
 
 
-async def _create_index_safe(conn, index_name: str, table: str, columns: str, where: str = None):
-    """Create index if it doesn't exist."""
-    if not await _index_exists(conn, index_name):
-        where_clause = f" WHERE {where}" if where else ""
-        unique = "UNIQUE " if index_name.endswith("_uq") else ""
-        await conn.execute(
-            f"CREATE {unique}INDEX {index_name} ON {table}({columns}){where_clause}"
-        )
-        logger.info(f"Created index {index_name}")
+async def _load_indexes(conn) -> set[str]:
+    """All index names in the public schema, in one catalog query."""
+    rows = await conn.fetch("SELECT indexname FROM pg_indexes WHERE schemaname = 'public'")
+    return {r["indexname"] for r in rows}
+
+
+async def _create_index_safe(
+    conn, index_name: str, table: str, columns: str, where: str = None, existing: set = None,
+):
+    """
+    Create index if it doesn't exist.
+    With `existing` (from _load_indexes) present indexes are skipped locally:
+    even a no-op CREATE INDEX IF NOT EXISTS takes a SHARE lock, blocking writes.
+    """
+    if existing is not None:
+        if index_name in existing:
+            return
+        existing.add(index_name)
+    where_clause = f" WHERE {where}" if where else ""
+    unique = "UNIQUE " if index_name.endswith("_uq") else ""
+    await conn.execute(
+        f"CREATE {unique}INDEX IF NOT EXISTS {index_name} ON {table}({columns}){where_clause}"
+    )
+    logger.info(f"Created index {index_name}")
 
 
 async def ensure_schema() -> bool:
@@ -161,10 +182,15 @@ async def ensure_schema() -> bool:
                 # Non-fatal: gen_random_uuid() is built-in on PG 13+
                 logger.warning(f"Could not enable pgcrypto (OK on PG 13+): {e}")
 
+            # One catalog read up front; the checks below are set lookups
+            columns = await _load_columns(conn)
+            indexes = await _load_indexes(conn)
+            tables = {t for t, _ in columns}
+
             # =========================================================
             # 1. LISTINGS TABLE
             # =========================================================
-            if not await _table_exists(conn, "listings"):
+            if "listings" not in tables:
                 await conn.execute("""
                     CREATE TABLE listings (
                         id                uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -188,22 +214,22 @@ async def ensure_schema() -> bool:
                 logger.info("Created listings table")
             else:
                 # Add missing columns to existing listings table
-                await _add_column_if_not_exists(conn, "listings", "currency", "text NOT NULL DEFAULT 'UZS'")
-                await _add_column_if_not_exists(conn, "listings", "phone", "text")
-                await _add_column_if_not_exists(conn, "listings", "latitude", "double precision")
-                await _add_column_if_not_exists(conn, "listings", "longitude", "double precision")
-                await _add_column_if_not_exists(conn, "listings", "address", "text")
-                await _add_column_if_not_exists(conn, "listings", "photos", "jsonb NOT NULL DEFAULT '[]'::jsonb")
-                await _add_column_if_not_exists(conn, "listings", "is_active", "boolean NOT NULL DEFAULT true")
-                await _add_column_if_not_exists(conn, "listings", "subtype", "text")
-                await _add_column_if_not_exists(conn, "listings", "region", "text NOT NULL DEFAULT 'zomin'")
-                await _add_column_if_not_exists(conn, "listings", "category", "text NOT NULL DEFAULT 'hotel'")
-                await _add_column_if_not_exists(conn, "listings", "telegram_admin_id", "bigint NOT NULL DEFAULT 0")
+                await _add_column_if_not_exists(conn, "listings", "currency", "text NOT NULL DEFAULT 'UZS'", columns)
+                await _add_column_if_not_exists(conn, "listings", "phone", "text", columns)
+                await _add_column_if_not_exists(conn, "listings", "latitude", "double precision", columns)
+                await _add_column_if_not_exists(conn, "listings", "longitude", "double precision", columns)
+                await _add_column_if_not_exists(conn, "listings", "address", "text", columns)
+                await _add_column_if_not_exists(conn, "listings", "photos", "jsonb NOT NULL DEFAULT '[]'::jsonb", columns)
+                await _add_column_if_not_exists(conn, "listings", "is_active", "boolean NOT NULL DEFAULT true", columns)
+                await _add_column_if_not_exists(conn, "listings", "subtype", "text", columns)
+                await _add_column_if_not_exists(conn, "listings", "region", "text NOT NULL DEFAULT 'zomin'", columns)
+                await _add_column_if_not_exists(conn, "listings", "category", "text NOT NULL DEFAULT 'hotel'", columns)
+                await _add_column_if_not_exists(conn, "listings", "telegram_admin_id", "bigint NOT NULL DEFAULT 0", columns)
 
             # =========================================================
             # 2. BOOKINGS TABLE - with partner_id -> listing_id migration
             # =========================================================
-            if not await _table_exists(conn, "bookings"):
+            if "bookings" not in tables:
                 await conn.execute("""
                     CREATE TABLE bookings (
                         id               uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -218,8 +244,8 @@ async def ensure_schema() -> bool:
                 logger.info("Created bookings table")
             else:
                 # Handle migration from old schema
-                has_partner_id = await _column_exists(conn, "bookings", "partner_id")
-                has_listing_id = await _column_exists(conn, "bookings", "listing_id")
+                has_partner_id = ("bookings", "partner_id") in columns
+                has_listing_id = ("bookings", "listing_id") in columns
                 
                 if has_partner_id and not has_listing_id:
                     # Rename partner_id to listing_id
@@ -231,14 +257,14 @@ async def ensure_schema() -> bool:
                     logger.info("Added bookings.listing_id column")
                 
                 # Add other missing columns
-                await _add_column_if_not_exists(conn, "bookings", "user_telegram_id", "bigint NOT NULL DEFAULT 0")
-                await _add_column_if_not_exists(conn, "bookings", "payload", "jsonb NOT NULL DEFAULT '{}'::jsonb")
-                await _add_column_if_not_exists(conn, "bookings", "status", "text NOT NULL DEFAULT 'new'")
-                await _add_column_if_not_exists(conn, "bookings", "expires_at", "timestamptz")
-                await _add_column_if_not_exists(conn, "bookings", "created_at", "timestamptz NOT NULL DEFAULT now()")
+                await _add_column_if_not_exists(conn, "bookings", "user_telegram_id", "bigint NOT NULL DEFAULT 0", columns)
+                await _add_column_if_not_exists(conn, "bookings", "payload", "jsonb NOT NULL DEFAULT '{}'::jsonb", columns)
+                await _add_column_if_not_exists(conn, "bookings", "status", "text NOT NULL DEFAULT 'new'", columns)
+                await _add_column_if_not_exists(conn, "bookings", "expires_at", "timestamptz", columns)
+                await _add_column_if_not_exists(conn, "bookings", "created_at", "timestamptz NOT NULL DEFAULT now()", columns)
                 
                 # Drop old columns that might conflict (service_type from old schema)
-                if await _column_exists(conn, "bookings", "service_type"):
+                if ("bookings", "service_type") in columns:
                     # Keep it for now, just log
                     logger.info("Note: bookings.service_type exists from old schema")
             
@@ -261,16 +287,16 @@ async def ensure_schema() -> bool:
             # =========================================================
             # 4. INDEXES
             # =========================================================
-            await _create_index_safe(conn, "idx_listings_region_category", "listings", "region, category, is_active")
-            await _create_index_safe(conn, "idx_listings_admin", "listings", "telegram_admin_id")
-            await _create_index_safe(conn, "idx_bookings_listing_status", "bookings", "listing_id, status")
-            await _create_index_safe(conn, "idx_bookings_user_created", "bookings", "user_telegram_id, created_at DESC")
-            await _create_index_safe(conn, "idx_bookings_expires", "bookings", "expires_at, status", "expires_at IS NOT NULL")
+            await _create_index_safe(conn, "idx_listings_region_category", "listings", "region, category, is_active", existing=indexes)
+            await _create_index_safe(conn, "idx_listings_admin", "listings", "telegram_admin_id", existing=indexes)
+            await _create_index_safe(conn, "idx_bookings_listing_status", "bookings", "listing_id, status", existing=indexes)
+            await _create_index_safe(conn, "idx_bookings_user_created", "bookings", "user_telegram_id, created_at DESC", existing=indexes)
+            await _create_index_safe(conn, "idx_bookings_expires", "bookings", "expires_at, status", "expires_at IS NOT NULL", existing=indexes)
 
             # =========================================================
             # 5. USERS TABLE
             # =========================================================
-            if not await _table_exists(conn, "users"):
+            if "users" not in tables:
                 await conn.execute("""
                     CREATE TABLE users (
                         id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -285,12 +311,12 @@ async def ensure_schema() -> bool:
                 logger.info("Created users table")
             
             # Ensure unique index on telegram_id (safe/idempotent)
-            await _create_index_safe(conn, "users_telegram_id_uq", "users", "telegram_id", None)
+            await _create_index_safe(conn, "users_telegram_id_uq", "users", "telegram_id", existing=indexes)
 
             # =========================================================
             # 6. OWNER_USER_ID on listings (partner routing)
             # =========================================================
-            await _add_column_if_not_exists(conn, "listings", "owner_user_id", "BIGINT")
+            await _add_column_if_not_exists(conn, "listings", "owner_user_id", "BIGINT", columns)
             # Backfill: existing rows get owner_user_id = telegram_admin_id
             await conn.execute("""
                 UPDATE listings SET owner_user_id = telegram_admin_id
@@ -300,9 +326,9 @@ async def ensure_schema() -> bool:
             # =========================================================
             # 7. PARTNER_MESSAGE_ID on bookings
             # =========================================================
-            await _add_column_if_not_exists(conn, "bookings", "owner_user_id", "BIGINT")
-            await _add_column_if_not_exists(conn, "bookings", "partner_message_id", "BIGINT")
-            await _add_column_if_not_exists(conn, "bookings", "dispatched_at", "TIMESTAMPTZ")
+            await _add_column_if_not_exists(conn, "bookings", "owner_user_id", "BIGINT", columns)
+            await _add_column_if_not_exists(conn, "bookings", "partner_message_id", "BIGINT", columns)
+            await _add_column_if_not_exists(conn, "bookings", "dispatched_at", "TIMESTAMPTZ", columns)
 
             # =========================================================
             # 8. INDEXES for dispatch/timeout performance
@@ -310,16 +336,60 @@ async def ensure_schema() -> bool:
             await _create_index_safe(
                 conn, "bookings_status_expires_idx", "bookings",
                 "status, expires_at", None,
+                existing=indexes,
             )
             await _create_index_safe(
                 conn, "bookings_owner_idx", "bookings",
                 "owner_user_id", None,
+                existing=indexes,
             )
             await _create_index_safe(
                 conn, "listings_owner_idx", "listings",
                 "owner_user_id", None,
+                existing=indexes,
+            )
+            # /my_listings: WHERE telegram_admin_id = $1 ORDER BY created_at DESC
+            await _create_index_safe(
+                conn, "listings_admin_created_idx", "listings",
+                "telegram_admin_id, created_at DESC", None,
+                existing=indexes,
+            )
+            # Timeout checker: only still-pending bookings, by dispatch time
+            await _create_index_safe(
+                conn, "bookings_pending_due_idx", "bookings",
+                "(COALESCE(dispatched_at, created_at))",
+                "status IN ('pending_partner', 'sent')",
+                existing=indexes,
             )
 
+            # =========================================================
+            # 9. Listing change notifications (cache invalidation)
+            # =========================================================
+            # Any write to listings - from this process, another instance
+            # or a manual SQL edit - NOTIFYs every listening bot process.
+            await conn.execute(f"""
+                CREATE OR REPLACE FUNCTION notify_listings_changed() RETURNS trigger AS $$
+                BEGIN
+                    PERFORM pg_notify('{LISTINGS_CHANNEL}', '');
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """)
+            # CREATE TRIGGER locks listings exclusively - only run it once
+            has_trigger = await conn.fetchval("""
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_trigger
+                    WHERE tgrelid = 'listings'::regclass
+                      AND tgname = 'listings_changed_notify'
+                )
+            """)
+            if not has_trigger:
+                await conn.execute("""
+                    CREATE TRIGGER listings_changed_notify
+                    AFTER INSERT OR UPDATE OR DELETE ON listings
+                    FOR EACH STATEMENT EXECUTE PROCEDURE notify_listings_changed()
+                """)
+
         logger.info("DB schema ensured (listings, bookings, users) - migration complete")
         return True
         
@@ -350,6 +420,8 @@ async def reset_schema() -> bool:
             await conn.execute("DROP TABLE IF EXISTS partners CASCADE")  # Old table
             logger.warning("All tables dropped!")
         
+        invalidate_listings_cache()
+        _users_cache.clear()
         return await ensure_schema()
     except Exception as e:
         logger.exception(f"Failed to reset schema: {e}")
@@ -360,6 +432,45 @@ async def reset_schema() -> bool:
 # Pool Lifecycle
 # =============================================================================
 
+def _orjson_dumps(value) -> str:
+    """orjson.dumps returning str, as the asyncpg text codec expects."""
+    return orjson.dumps(value).decode()
+
+
+_json_encoder, _json_decoder = (
+    (_orjson_dumps, orjson.loads) if orjson else (json.dumps, json.loads)
+)
+
+
+async def _init_connection(conn) -> None:
+    """Per-connection setup: decode/encode json(b) columns to Python objects in the driver."""
+    for typename in ("jsonb", "json"):
+        await conn.set_type_codec(
+            typename,
+            encoder=_json_encoder,
+            decoder=_json_decoder,
+            schema="pg_catalog",
+        )
+
+
+def _server_settings(pgbouncer: bool) -> dict[str, str]:
+    """Session settings sent once at connect (no per-query SET)."""
+    settings = {"application_name": "safartrip-bot"}
+    if pgbouncer:
+        # PgBouncer rejects other startup parameters (or silently drops them
+        # via ignore_startup_parameters); set these on the database role:
+        #   ALTER ROLE <user> SET jit = off;  -- etc.
+        return settings
+    # Short OLTP queries never benefit from JIT compilation, and a runaway
+    # statement is cancelled server-side, not just client-side.
+    settings.update({
+        "jit": "off",
+        "statement_timeout": "30000",
+        "idle_in_transaction_session_timeout": "60000",
+    })
+    return settings
+
+
 async def init_pool() -> bool:
     """Initialize asyncpg connection pool."""
     global _pool
@@ -377,25 +488,122 @@ async def init_pool() -> bool:
         import asyncpg
         
         ssl_ctx = get_ssl_context()
+        min_size, max_size = get_pool_sizes()
         
+        # Keep enough warm connections for bursts of concurrent handlers
+        # (sized per deployment via DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE, kept
+        # under the Postgres plan's connection limit);
+        # recycle idle ones so Railway doesn't drop them under us.
+        # All queries use $n placeholders with fixed SQL text, so each one is
+        # parsed/planned once per connection and then served from the
+        # statement cache; keep entries for an hour instead of asyncpg's
+        # 5-minute default so quiet periods don't force a re-PARSE.
+        # Behind PgBouncer in transaction mode consecutive queries may land on
+        # different server connections, so prepared statements can't be
+        # reused and the cache must be off.
+        pgbouncer = uses_pgbouncer()
         _pool = await asyncpg.create_pool(
             url,
-            min_size=2,
-            max_size=10,
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=0 if pgbouncer else 1024,
+            max_cached_statement_lifetime=3600,
             command_timeout=30,
             ssl=ssl_ctx,
+            init=_init_connection,
+            server_settings=_server_settings(pgbouncer),
         )
         
-        logger.info("PostgreSQL pool initialized")
+        logger.info(
+            f"PostgreSQL pool initialized (min={min_size}, max={max_size}, "
+            f"statement cache {'off (PgBouncer)' if pgbouncer else 'on'})"
+        )
+        if pgbouncer:
+            # LISTEN "succeeds" through a transaction-mode pooler, but the
+            # server connection is handed back after each statement and
+            # notifications never arrive.
+            logger.info(
+                f"Listings change listener disabled (PgBouncer); "
+                f"cache entries expire after {LISTINGS_CACHE_TTL}s"
+            )
+        elif not await _start_listings_listener(url, ssl_ctx):
+            _reconnect_listings_listener(url, ssl_ctx)
         return True
     except Exception as e:
         logger.exception(f"Failed to init pool: {e}")
         return False
 
 
+async def _start_listings_listener(url: str, ssl_ctx) -> bool:
+    """LISTEN for listing writes so every process drops its listings cache at once."""
+    global _listen_conn
+    import asyncpg
+
+    conn = None
+    try:
+        conn = await asyncpg.connect(
+            url,
+            ssl=ssl_ctx,
+            server_settings={"application_name": "safartrip-bot-listen"},
+        )
+        await conn.add_listener(LISTINGS_CHANNEL, _on_listings_changed)
+    except Exception as e:
+        # Not fatal: cached entries still expire after LISTINGS_CACHE_TTL
+        logger.warning(f"Listings change listener unavailable: {e}")
+        if conn:
+            conn.terminate()
+        return False
+
+    conn.add_termination_listener(lambda c: _on_listen_conn_lost(c, url, ssl_ctx))
+    _listen_conn = conn
+    logger.info(f"Listening on '{LISTINGS_CHANNEL}' for cache invalidation")
+    return True
+
+
+def _on_listen_conn_lost(conn, url: str, ssl_ctx) -> None:
+    """asyncpg termination callback: the LISTEN connection dropped (not via close_pool)."""
+    global _listen_conn
+    if conn is not _listen_conn:
+        return
+    _listen_conn = None
+    # Notifications sent while we were disconnected are lost
+    invalidate_listings_cache()
+    logger.warning("Listings change listener disconnected, reconnecting")
+    _reconnect_listings_listener(url, ssl_ctx)
+
+
+def _reconnect_listings_listener(url: str, ssl_ctx) -> None:
+    """Start the background reconnect loop (once)."""
+    global _listen_task
+    if _listen_task and not _listen_task.done():
+        return
+    _listen_task = asyncio.create_task(_listen_reconnect_loop(url, ssl_ctx))
+
+
+async def _listen_reconnect_loop(url: str, ssl_ctx) -> None:
+    """Retry the LISTEN connection with exponential backoff until it is back."""
+    delay = 1
+    while _pool:
+        await asyncio.sleep(delay)
+        if await _start_listings_listener(url, ssl_ctx):
+            # Writes made while reconnecting were never NOTIFYed to us
+            invalidate_listings_cache()
+            logger.info("Listings change listener reconnected")
+            return
+        delay = min(LISTEN_RECONNECT_MAX, delay * 2)
+
+
 async def close_pool():
     """Close the connection pool."""
-    global _pool
+    global _pool, _listen_conn, _listen_task
+    if _listen_task:
+        _listen_task.cancel()
+        _listen_task = None
+    if _listen_conn:
+        # Cleared first so the termination callback doesn't reconnect
+        conn, _listen_conn = _listen_conn, None
+        await conn.close()
     if _pool:
         await _pool.close()
         _pool = None
@@ -420,47 +628,6 @@ async def healthcheck() -> tuple[bool, str]:
 # Extended Health Check
 # =============================================================================
 
-async def get_schema_info() -> dict:
-    """Get detailed schema information for health check."""
-    if not _pool:
-        return {"error": "Pool not initialized"}
-    
-    try:
-        async with _pool.acquire() as conn:
-            info = {"tables": {}}
-            
-            # Check which tables exist
-            tables = await conn.fetch("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_type = 'BASE TABLE'
-            """)
-            
-            for t in tables:
-                tname = t["table_name"]
-                if tname in ("listings", "bookings", "partners"):
-                    # Get column info
-                    cols = await conn.fetch("""
-                        SELECT column_name, data_type, is_nullable
-                        FROM information_schema.columns
-                        WHERE table_schema = 'public' AND table_name = $1
-                        ORDER BY ordinal_position
-                    """, tname)
-                    
-                    # Get row count
-                    count = await conn.fetchval(f"SELECT COUNT(*) FROM {tname}")
-                    
-                    info["tables"][tname] = {
-                        "columns": [c["column_name"] for c in cols],
-                        "count": count,
-                    }
-            
-            return info
-    except Exception as e:
-        return {"error": str(e)}
-
-
 async def get_listings_stats() -> dict:
     """Get listing counts by category and subtype."""
     if not _pool:
@@ -493,11 +660,25 @@ async def get_listings_stats() -> dict:
 # Users CRUD
 # =============================================================================
 
+# Registered users change only through upsert_user (which invalidates), while
+# /start and every booking form look them up. Only hits are cached so a user
+# who registers is seen immediately.
+USERS_CACHE_TTL = 600
+_USERS_CACHE_MAX = 10_000
+# telegram id -> (fetched_at, user row dict)
+_users_cache: dict[int, tuple[float, dict]] = {}
+
+
 async def get_user_by_telegram_id(telegram_id: int) -> Optional[dict]:
-    """Get user by Telegram ID."""
+    """Get user by Telegram ID (cached; the returned dict is shared - do not mutate it)."""
     if not _pool:
         return None
     
+    telegram_id = int(telegram_id)
+    entry = _users_cache.get(telegram_id)
+    if entry and time.monotonic() - entry[0] < USERS_CACHE_TTL:
+        return entry[1]
+    
     try:
         async with _pool.acquire() as conn:
             row = await conn.fetchrow(
@@ -505,14 +686,19 @@ async def get_user_by_telegram_id(telegram_id: int) -> Optional[dict]:
                 SELECT id, telegram_id, phone, first_name, last_name, created_at
                 FROM users WHERE telegram_id = $1
                 """,
-                int(telegram_id),
+                telegram_id,
             )
             if not row:
                 return None
-            return dict(row)
+            user = dict(row)
     except Exception as e:
         logger.error(f"Error getting user: {e}")
         return None
+    
+    if len(_users_cache) >= _USERS_CACHE_MAX:
+        _users_cache.clear()
+    _users_cache[telegram_id] = (time.monotonic(), user)
+    return user
 
 
 async def upsert_user(telegram_id: int, phone: str, first_name: str, last_name: str) -> bool:
@@ -537,12 +723,88 @@ async def upsert_user(telegram_id: int, phone: str, first_name: str, last_name:
                 first_name,
                 last_name,
             )
+            _users_cache.pop(int(telegram_id), None)
             return True
     except Exception as e:
         logger.error(f"Error upserting user: {e}")
         return False
 
 
+# =============================================================================
+# ID Parsing
+# =============================================================================
+
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+
+
+@lru_cache(maxsize=4096)
+def _to_uuid(value) -> Optional[UUID]:
+    """Parse an id string to UUID (cached: the same few ids recur per booking flow); None if invalid."""
+    if isinstance(value, UUID):
+        return value
+    # Canonical form only; garbage is rejected without raising
+    if not isinstance(value, str) or not _UUID_RE.fullmatch(value):
+        return None
+    return UUID(value)
+
+
+_SHORT_ID_RE = re.compile(r"[0-9a-f]{1,32}", re.I)
+
+
+def _short_id_range(bid_short: str) -> Optional[tuple[UUID, UUID]]:
+    """
+    UUID bounds covering every id that starts with the hex prefix `bid_short`.
+    A range on the primary key uses its index, unlike `id::text LIKE 'abc%'`.
+    """
+    if not _SHORT_ID_RE.fullmatch(bid_short):
+        return None
+    return UUID(bid_short.ljust(32, "0")), UUID(bid_short.ljust(32, "f"))
+
+
+# =============================================================================
+# Shared SELECTs
+# =============================================================================
+
+# Queries are built from these fixed texts so every lookup returns the same
+# columns for the row converters, and the set of distinct statements (each
+# its own entry in asyncpg's per-connection statement cache) stays small.
+LISTING_SELECT = """
+    SELECT id, region, category, subtype, title, description,
+           price_from, currency, phone, telegram_admin_id, owner_user_id,
+           latitude, longitude, address, photos, is_active
+    FROM listings
+"""
+
+# Same listing dicts as _row_to_listing, but built and aggregated
+# server-side: a whole result set arrives as one jsonb value (decoded once
+# by the connection codec) instead of N rows converted field by field.
+# Listing dicts carry no created_at (jsonb would turn it into a string;
+# it is only used for ordering, here and in SQL).
+# Append a WHERE clause; ordering is inside the aggregate.
+LISTING_JSON_AGG = """
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'id', id::text, 'region', region, 'category', category,
+               'subtype', subtype, 'title', title, 'description', description,
+               'price_from', price_from, 'currency', currency, 'phone', phone,
+               'telegram_admin_id', telegram_admin_id,
+               'owner_user_id', COALESCE(NULLIF(owner_user_id, 0), telegram_admin_id),
+               'latitude', latitude, 'longitude', longitude, 'address', address,
+               'photos', COALESCE(photos, '[]'::jsonb), 'is_active', is_active
+           ) ORDER BY created_at DESC), '[]'::jsonb)
+    FROM listings
+"""
+
+BOOKING_SELECT = """
+    SELECT b.id, b.listing_id, b.user_telegram_id, b.payload,
+           b.status, b.expires_at, b.created_at,
+           b.owner_user_id, b.partner_message_id,
+           l.title as listing_title, l.category, l.telegram_admin_id,
+           l.price_from, l.currency
+    FROM bookings b
+    LEFT JOIN listings l ON b.listing_id = l.id
+"""
+
+
 # =============================================================================
 # Listings CRUD
 # =============================================================================
@@ -582,9 +844,10 @@ async def create_listing(data: dict[str, Any]) -> Optional[str]:
                 data.get("latitude"),
                 data.get("longitude"),
                 data.get("address"),
-                json.dumps(data.get("photos", [])),
+                data.get("photos", []),
                 int(data.get("owner_user_id") or data.get("telegram_admin_id", 0)),
             )
+            invalidate_listings_cache()
             logger.info(f"Created listing {listing_id}")
             return str(listing_id) if listing_id else None
     except Exception as e:
@@ -597,20 +860,14 @@ async def get_listing(listing_id: str) -> Optional[dict]:
     if not _pool:
         return None
 
-    try:
-        lid = UUID(listing_id)
-    except:
+    lid = _to_uuid(listing_id)
+    if lid is None:
         return None
 
     try:
         async with _pool.acquire() as conn:
             row = await conn.fetchrow(
-                """
-                SELECT id, region, category, subtype, title, description,
-                       price_from, currency, phone, telegram_admin_id,
-                       latitude, longitude, address, photos, is_active, created_at
-                FROM listings WHERE id = $1
-                """,
+                LISTING_SELECT + " WHERE id = $1",
                 lid,
             )
             if not row:
@@ -632,47 +889,157 @@ async def fetch_listings(
         return []
 
     try:
-        conditions = []
-        params = []
-        idx = 1
-
-        if active_only:
-            conditions.append("is_active = true")
+        return await _query_listings(region, category, subtype, active_only)
+    except Exception as e:
+        logger.exception(f"Error fetching listings: {e}")
+        return []
 
-        if region:
-            conditions.append(f"region = ${idx}")
-            params.append(region.lower())
-            idx += 1
 
-        if category:
-            conditions.append(f"category = ${idx}")
-            params.append(category.lower())
-            idx += 1
+async def _query_listings(
+    region: Optional[str],
+    category: Optional[str],
+    subtype: Optional[str],
+    active_only: bool,
+) -> list[dict]:
+    """Run the listings query. Raises on DB errors (callers decide what to swallow)."""
+    # One fixed SQL text for every filter combination (NULL = no filter), so
+    # asyncpg prepares it once per connection instead of once per variant.
+    async with _pool.acquire() as conn:
+        return await conn.fetchval(
+            LISTING_JSON_AGG + """
+            WHERE (NOT $1::boolean OR is_active)
+              AND ($2::text IS NULL OR region = $2)
+              AND ($3::text IS NULL OR category = $3)
+              AND ($4::text IS NULL OR subtype = $4)
+            """,
+            active_only,
+            region.lower() if region else None,
+            category.lower() if category else None,
+            subtype.lower() if subtype else None,
+        )
 
-        if subtype:
-            conditions.append(f"subtype = ${idx}")
-            params.append(subtype.lower())
-            idx += 1
 
-        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+# =============================================================================
+# Listings Cache (in-process, TTL)
+# =============================================================================
 
-        async with _pool.acquire() as conn:
-            rows = await conn.fetch(
-                f"""
-                SELECT id, region, category, subtype, title, description,
-                       price_from, currency, phone, telegram_admin_id,
-                       latitude, longitude, address, photos, is_active, created_at
-                FROM listings
-                {where}
-                ORDER BY created_at DESC
-                """,
-                *params,
-            )
-            return [_row_to_listing(r) for r in rows]
-    except Exception as e:
-        logger.exception(f"Error fetching listings: {e}")
+# Browsing re-runs the same few catalog queries on every tap, while listings
+# only change through /add and /my_listings. Entries are invalidated on every
+# listing write below; the TTL bounds staleness for writes from other workers.
+LISTINGS_CACHE_TTL = 60  # seconds
+# Empty results (category/subtype with no listings yet) are kept longer:
+# they are the common case while the catalog is being filled, and any
+# /add invalidates them immediately anyway.
+LISTINGS_CACHE_NEG_TTL = 120  # seconds
+
+# (region, category, subtype) -> (fetched_at, listings)
+_listings_cache: dict[tuple, tuple[float, list[dict]]] = {}
+_listings_locks: dict[tuple, asyncio.Lock] = {}
+# listing id -> (fetched_at, listing), filled from the same snapshots
+_listings_by_id: dict[str, tuple[float, dict]] = {}
+# admin telegram id -> (fetched_at, listings incl. inactive)
+_admin_listings_cache: dict[int, tuple[float, list[dict]]] = {}
+_admin_listings_locks: dict[int, asyncio.Lock] = {}
+# Bumped by every invalidation: a refill that started before a write must
+# not store its (pre-write) snapshot afterwards.
+_listings_generation = 0
+
+
+def _listings_cache_get(key: tuple) -> Optional[list[dict]]:
+    """Return a fresh cache entry or None."""
+    entry = _listings_cache.get(key)
+    if entry:
+        ttl = LISTINGS_CACHE_TTL if entry[1] else LISTINGS_CACHE_NEG_TTL
+        if time.monotonic() - entry[0] < ttl:
+            return entry[1]
+    return None
+
+
+async def fetch_listings_cached(
+    region: str = None,
+    category: str = None,
+    subtype: str = None,
+) -> list[dict]:
+    """
+    Fetch active listings through the TTL cache.
+    Concurrent misses for the same filter share a single query.
+    The returned list is shared between callers - do not mutate it.
+    """
+    if not _pool:
         return []
 
+    key = (
+        region.lower() if region else None,
+        category.lower() if category else None,
+        subtype.lower() if subtype else None,
+    )
+    cached = _listings_cache_get(key)
+    if cached is not None:
+        return cached
+
+    lock = _listings_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another waiter may have refilled the entry while we were queued
+        cached = _listings_cache_get(key)
+        if cached is not None:
+            return cached
+
+        generation = _listings_generation
+        try:
+            listings = await _query_listings(*key, active_only=True)
+        except Exception as e:
+            # Don't cache failures
+            logger.exception(f"Error fetching listings: {e}")
+            return []
+
+        if generation != _listings_generation:
+            return listings
+        now = time.monotonic()
+        _listings_cache[key] = (now, listings)
+        for listing in listings:
+            _listings_by_id[listing["id"]] = (now, listing)
+        return listings
+
+
+async def get_listing_cached(listing_id: str) -> Optional[dict]:
+    """Get a single listing, served from the cache snapshots when fresh."""
+    entry = _listings_by_id.get(listing_id)
+    if entry and time.monotonic() - entry[0] < LISTINGS_CACHE_TTL:
+        return entry[1]
+
+    generation = _listings_generation
+    listing = await get_listing(listing_id)
+    if listing and generation == _listings_generation:
+        _listings_by_id[listing_id] = (time.monotonic(), listing)
+    return listing
+
+
+def invalidate_listings_cache() -> None:
+    """Drop all cached listing queries (call after any listing write)."""
+    global _listings_generation
+    _listings_generation += 1
+    _listings_cache.clear()
+    _listings_by_id.clear()
+    _admin_listings_cache.clear()
+
+
+# NOTIFY channel fired by the listings trigger (see ensure_schema)
+LISTINGS_CHANNEL = "listings_changed"
+
+
+def _on_listings_changed(conn, pid, channel, payload) -> None:
+    """asyncpg listener callback: a listing changed somewhere."""
+    invalidate_listings_cache()
+
+
+async def _query_listings_by_admin(admin_id: int) -> list[dict]:
+    """Run the per-admin listings query. Raises on DB errors."""
+    async with _pool.acquire() as conn:
+        return await conn.fetchval(
+            LISTING_JSON_AGG + " WHERE telegram_admin_id = $1",
+            int(admin_id),
+        )
+
 
 async def fetch_listings_by_admin(admin_id: int) -> list[dict]:
     """Get all listings owned by a specific admin."""
@@ -680,32 +1047,49 @@ async def fetch_listings_by_admin(admin_id: int) -> list[dict]:
         return []
 
     try:
-        async with _pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, region, category, subtype, title, description,
-                       price_from, currency, phone, telegram_admin_id,
-                       latitude, longitude, address, photos, is_active, created_at
-                FROM listings
-                WHERE telegram_admin_id = $1
-                ORDER BY created_at DESC
-                """,
-                int(admin_id),
-            )
-            return [_row_to_listing(r) for r in rows]
+        return await _query_listings_by_admin(admin_id)
     except Exception as e:
         logger.exception(f"Error fetching listings by admin: {e}")
         return []
 
 
+async def fetch_listings_by_admin_cached(admin_id: int) -> list[dict]:
+    """
+    Per-admin listings through the TTL cache (/my_listings view, toggle, delete).
+    The returned list is shared between callers - do not mutate it.
+    """
+    if not _pool:
+        return []
+
+    entry = _admin_listings_cache.get(admin_id)
+    if entry and time.monotonic() - entry[0] < LISTINGS_CACHE_TTL:
+        return entry[1]
+
+    async with _admin_listings_locks.setdefault(admin_id, asyncio.Lock()):
+        entry = _admin_listings_cache.get(admin_id)
+        if entry and time.monotonic() - entry[0] < LISTINGS_CACHE_TTL:
+            return entry[1]
+
+        generation = _listings_generation
+        try:
+            listings = await _query_listings_by_admin(admin_id)
+        except Exception as e:
+            # Don't cache failures
+            logger.exception(f"Error fetching listings by admin: {e}")
+            return []
+
+        if generation == _listings_generation:
+            _admin_listings_cache[admin_id] = (time.monotonic(), listings)
+        return listings
+
+
 async def toggle_listing_active(listing_id: str, is_active: bool) -> bool:
     """Toggle listing active status."""
     if not _pool:
         return False
 
-    try:
-        lid = UUID(listing_id)
-    except:
+    lid = _to_uuid(listing_id)
+    if lid is None:
         return False
 
     try:
@@ -715,6 +1099,7 @@ async def toggle_listing_active(listing_id: str, is_active: bool) -> bool:
                 is_active,
                 lid,
             )
+            invalidate_listings_cache()
             return res == "UPDATE 1"
     except Exception as e:
         logger.exception(f"Error toggling listing: {e}")
@@ -726,14 +1111,14 @@ async def delete_listing(listing_id: str) -> bool:
     if not _pool:
         return False
 
-    try:
-        lid = UUID(listing_id)
-    except:
+    lid = _to_uuid(listing_id)
+    if lid is None:
         return False
 
     try:
         async with _pool.acquire() as conn:
             res = await conn.execute("DELETE FROM listings WHERE id = $1", lid)
+            invalidate_listings_cache()
             return res == "DELETE 1"
     except Exception as e:
         logger.exception(f"Error deleting listing: {e}")
@@ -741,13 +1126,9 @@ async def delete_listing(listing_id: str) -> bool:
 
 
 def _row_to_listing(row) -> dict:
-    """Convert asyncpg row to listing dict."""
+    """Convert asyncpg row to listing dict (same shape as LISTING_JSON_AGG items; no created_at)."""
+    # jsonb arrives already decoded (codec set in _init_connection)
     photos = row.get("photos") or []
-    if isinstance(photos, str):
-        try:
-            photos = json.loads(photos)
-        except:
-            photos = []
     
     return {
         "id": str(row["id"]),
@@ -764,9 +1145,8 @@ def _row_to_listing(row) -> dict:
         "latitude": row.get("latitude"),
         "longitude": row.get("longitude"),
         "address": row.get("address"),
-        "photos": list(photos) if photos else [],
+        "photos": photos,
         "is_active": row.get("is_active", True),
-        "created_at": row.get("created_at"),
     }
 
 
@@ -780,19 +1160,22 @@ async def create_booking(
     payload: dict,
     expires_minutes: int = 5,
     **kwargs,
-) -> Optional[str]:
+) -> Optional[dict]:
     """
     Create a new booking with expiration.
+    The owner is resolved from the listing inside the same INSERT
+    (owner_user_id, falling back to telegram_admin_id) unless an explicit
+    owner_user_id kwarg is given.
     
     Returns:
-        Booking UUID string or None on error
+        The new booking (same shape as get_booking, via RETURNING — no
+        re-read needed for dispatch), or None on error / unknown listing
     """
     if not _pool:
         return None
 
-    try:
-        lid = UUID(listing_id)
-    except:
+    lid = _to_uuid(listing_id)
+    if lid is None:
         return None
 
     owner_user_id = kwargs.get("owner_user_id", 0)
@@ -801,21 +1184,34 @@ async def create_booking(
         expires_at = datetime.utcnow() + timedelta(minutes=expires_minutes)
         
         async with _pool.acquire() as conn:
-            booking_id = await conn.fetchval(
+            row = await conn.fetchrow(
                 """
-                INSERT INTO bookings(listing_id, user_telegram_id, payload,
-                                    status, expires_at, owner_user_id)
-                VALUES ($1, $2, $3::jsonb, 'pending_partner', $4, $5)
-                RETURNING id
+                WITH ins AS (
+                    INSERT INTO bookings(listing_id, user_telegram_id, payload,
+                                        status, expires_at, owner_user_id)
+                    SELECT l.id, $2, $3::jsonb, 'pending_partner', $4,
+                           COALESCE($5::bigint, NULLIF(l.owner_user_id, 0), NULLIF(l.telegram_admin_id, 0))
+                    FROM listings l
+                    WHERE l.id = $1
+                    RETURNING id, listing_id, user_telegram_id, payload, status,
+                              expires_at, created_at, owner_user_id, partner_message_id
+                )
+                SELECT ins.*,
+                       l.title as listing_title, l.category, l.telegram_admin_id,
+                       l.price_from, l.currency
+                FROM ins
+                JOIN listings l ON ins.listing_id = l.id
                 """,
                 lid,
                 int(user_telegram_id),
-                json.dumps(payload),
+                payload,
                 expires_at,
                 int(owner_user_id) if owner_user_id else None,
             )
-            logger.info(f"Created booking {booking_id}")
-            return str(booking_id) if booking_id else None
+            if not row:
+                return None
+            logger.info(f"Created booking {row['id']}")
+            return _row_to_booking(row)
     except Exception as e:
         logger.exception(f"Error creating booking: {e}")
         return None
@@ -826,24 +1222,14 @@ async def get_booking(booking_id: str) -> Optional[dict]:
     if not _pool:
         return None
 
-    try:
-        bid = UUID(booking_id)
-    except:
+    bid = _to_uuid(booking_id)
+    if bid is None:
         return None
 
     try:
         async with _pool.acquire() as conn:
             row = await conn.fetchrow(
-                """
-                SELECT b.id, b.listing_id, b.user_telegram_id, b.payload,
-                       b.status, b.expires_at, b.created_at,
-                       b.owner_user_id, b.partner_message_id,
-                       l.title as listing_title, l.category, l.telegram_admin_id,
-                       l.price_from, l.currency
-                FROM bookings b
-                LEFT JOIN listings l ON b.listing_id = l.id
-                WHERE b.id = $1
-                """,
+                BOOKING_SELECT + " WHERE b.id = $1",
                 bid,
             )
             if not row:
@@ -859,9 +1245,8 @@ async def update_booking_status(booking_id: str, status: str) -> bool:
     if not _pool:
         return False
 
-    try:
-        bid = UUID(booking_id)
-    except:
+    bid = _to_uuid(booking_id)
+    if bid is None:
         return False
 
     try:
@@ -877,63 +1262,47 @@ async def update_booking_status(booking_id: str, status: str) -> bool:
         return False
 
 
-async def accept_booking_atomic(booking_id: str, owner_user_id: int) -> bool:
-    """
-    Atomically accept a booking.
-    Only succeeds if status is pending_partner/sent AND owner matches.
-    Prevents race conditions from double-click or concurrent accept+reject.
-    """
-    if not _pool:
-        return False
-    try:
-        bid = UUID(booking_id)
-    except Exception:
-        return False
-    try:
-        async with _pool.acquire() as conn:
-            res = await conn.execute(
-                """
-                UPDATE bookings SET status = 'accepted'
-                WHERE id = $1
-                  AND status IN ('pending_partner', 'sent')
-                  AND owner_user_id = $2
-                """,
-                bid,
-                int(owner_user_id),
-            )
-            return res == "UPDATE 1"
-    except Exception as e:
-        logger.exception(f"Error accepting booking atomically: {e}")
-        return False
+# Booking as it was before the statement, plus whether the UPDATE applied
+_DECIDE_BOOKING_SQL = """
+    WITH target AS (
+        SELECT id FROM bookings WHERE id BETWEEN $1 AND $2 LIMIT 1
+    ), upd AS (
+        UPDATE bookings SET status = $4
+        WHERE id = (SELECT id FROM target)
+          AND status IN ('pending_partner', 'sent')
+          AND owner_user_id = $3
+        RETURNING id
+    )
+    SELECT q.*, EXISTS (SELECT 1 FROM upd) AS updated
+    FROM (""" + BOOKING_SELECT + """ WHERE b.id = (SELECT id FROM target)) q
+"""
 
 
-async def reject_booking_atomic(booking_id: str, owner_user_id: int) -> bool:
+async def decide_booking(
+    bid_short: str, owner_user_id: int, new_status: str,
+) -> tuple[Optional[dict], bool]:
     """
-    Atomically reject a booking.
-    Only succeeds if status is pending_partner/sent AND owner matches.
+    Atomically accept/reject a booking found by short ID prefix.
+    Sets `new_status` only if status is pending_partner/sent AND owner matches,
+    so a double-click or concurrent accept+reject can't both succeed.
+    Returns (booking before the update or None, whether it was updated).
     """
     if not _pool:
-        return False
-    try:
-        bid = UUID(booking_id)
-    except Exception:
-        return False
+        return None, False
+    bounds = _short_id_range(bid_short)
+    if not bounds:
+        return None, False
+
     try:
         async with _pool.acquire() as conn:
-            res = await conn.execute(
-                """
-                UPDATE bookings SET status = 'rejected'
-                WHERE id = $1
-                  AND status IN ('pending_partner', 'sent')
-                  AND owner_user_id = $2
-                """,
-                bid,
-                int(owner_user_id),
-            )
-            return res == "UPDATE 1"
+            row = await conn.fetchrow(_DECIDE_BOOKING_SQL, *bounds, int(owner_user_id), new_status)
     except Exception as e:
-        logger.exception(f"Error rejecting booking atomically: {e}")
-        return False
+        logger.exception(f"Error deciding booking: {e}")
+        return None, False
+
+    if not row:
+        return None, False
+    return _row_to_booking(row), row["updated"]
 
 
 async def fetch_expired_bookings() -> list[dict]:
@@ -955,7 +1324,7 @@ async def fetch_expired_bookings() -> list[dict]:
                     UPDATE bookings
                     SET status = 'timeout'
                     WHERE status IN ('pending_partner', 'sent')
-                      AND COALESCE(dispatched_at, created_at) + interval '5 minutes' < NOW()
+                      AND COALESCE(dispatched_at, created_at) < NOW() - interval '5 minutes'
                     RETURNING id, user_telegram_id, owner_user_id, listing_id
                 )
                 SELECT e.id, e.user_telegram_id, e.owner_user_id,
@@ -988,11 +1357,6 @@ async def fetch_expired_bookings() -> list[dict]:
 def _row_to_booking(row) -> dict:
     """Convert asyncpg row to booking dict."""
     payload = row.get("payload") or {}
-    if isinstance(payload, str):
-        try:
-            payload = json.loads(payload)
-        except:
-            payload = {}
     
     return {
         "id": str(row["id"]),
@@ -1000,7 +1364,7 @@ def _row_to_booking(row) -> dict:
         "user_telegram_id": row.get("user_telegram_id", 0),
         "owner_user_id": row.get("owner_user_id", 0),
         "partner_message_id": row.get("partner_message_id"),
-        "payload": dict(payload) if payload else {},
+        "payload": payload,
         "status": row.get("status", "new"),
         "expires_at": row.get("expires_at"),
         "created_at": row.get("created_at"),
@@ -1018,9 +1382,8 @@ async def save_partner_message_id(booking_id: str, message_id: int) -> bool:
     """
     if not _pool:
         return False
-    try:
-        bid = UUID(booking_id)
-    except Exception:
+    bid = _to_uuid(booking_id)
+    if bid is None:
         return False
     try:
         async with _pool.acquire() as conn:
@@ -1044,9 +1407,8 @@ async def mark_booking_dispatched(booking_id: str, partner_msg_id: int) -> bool:
     """
     if not _pool:
         return False
-    try:
-        bid = UUID(booking_id)
-    except Exception:
+    bid = _to_uuid(booking_id)
+    if bid is None:
         return False
     try:
         async with _pool.acquire() as conn:
@@ -1083,17 +1445,6 @@ async def get_listings_count() -> int:
         return 0
 
 
-async def get_bookings_count() -> int:
-    """Get total bookings count."""
-    if not _pool:
-        return 0
-    try:
-        async with _pool.acquire() as conn:
-            return await conn.fetchval("SELECT COUNT(*) FROM bookings") or 0
-    except:
-        return 0
-
-
 async def get_bookings_by_status() -> dict[str, int]:
     """Get booking counts grouped by status."""
     if not _pool:
@@ -1179,6 +1530,8 @@ async def reset_database() -> bool:
             await conn.execute("DROP TABLE IF EXISTS partners CASCADE")
             logger.info("Tables dropped, recreating schema...")
         
+        invalidate_listings_cache()
+
         # Recreate schema
         return await ensure_schema()
     except Exception as e:
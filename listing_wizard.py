@@ -10,8 +10,8 @@ Wizard flow:
 Category → Title → Description → Region → Subtype → Price → Phone → Location → Photos → Confirm → Save
 """
 
-import html
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from aiogram import Router, Bot, F
@@ -27,6 +27,7 @@ from aiogram.exceptions import TelegramBadRequest
 
 from config import ADMINS
 import db_postgres as db
+from utils import ack, h
 
 logger = logging.getLogger(__name__)
 
@@ -60,13 +61,6 @@ listing_wizard_router.callback_query.filter(AdminFilter())
 # HTML Safety Helpers
 # =============================================================================
 
-def h(text) -> str:
-    """HTML-escape any value."""
-    if text is None:
-        return ""
-    return html.escape(str(text), quote=False)
-
-
 async def safe_send(message: Message, text: str, reply_markup=None, **kwargs) -> Message:
     """Send with HTML fallback."""
     try:
@@ -82,9 +76,10 @@ async def safe_edit(message: Message, text: str, reply_markup=None) -> Optional[
     try:
         return await message.edit_text(text, parse_mode="HTML", reply_markup=reply_markup)
     except TelegramBadRequest as e:
-        if "can't parse entities" in str(e).lower():
+        err = str(e).lower()
+        if "can't parse entities" in err:
             return await message.edit_text(text, parse_mode=None, reply_markup=reply_markup)
-        if "message is not modified" in str(e).lower():
+        if "message is not modified" in err:
             return message
         raise
 
@@ -128,6 +123,12 @@ HOTEL_SUBTYPES = [
     ("dacha", "Dacha"),
 ]
 
+# code -> display name lookups (built once, not per message)
+CATEGORY_NAMES = dict(CATEGORIES)
+HOTEL_SUBTYPE_NAMES = dict(HOTEL_SUBTYPES)
+CATEGORY_EMOJI = {"hotel": "🏨", "guide": "🧑‍💼", "taxi": "🚕", "place": "📍"}
+CATEGORY_PLAIN_NAMES = {"hotel": "Mehmonxona", "guide": "Gid", "taxi": "Taxi", "place": "Joy"}
+
 LOCATION_REQUIRED = {"hotel", "place"}
 PHOTOS_REQUIRED = {"hotel", "place"}
 PRICE_CATEGORIES = {"hotel", "taxi"}
@@ -147,6 +148,7 @@ def is_admin(user_id: int) -> bool:
 # Keyboards
 # =============================================================================
 
+@lru_cache(maxsize=None)
 def kb_categories() -> InlineKeyboardMarkup:
     """Category selection keyboard."""
     buttons = [[InlineKeyboardButton(text=name, callback_data=f"wiz:cat:{code}")] for code, name in CATEGORIES]
@@ -154,6 +156,7 @@ def kb_categories() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=None)
 def kb_regions() -> InlineKeyboardMarkup:
     """Region selection keyboard."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -162,6 +165,7 @@ def kb_regions() -> InlineKeyboardMarkup:
     ])
 
 
+@lru_cache(maxsize=None)
 def kb_subtypes() -> InlineKeyboardMarkup:
     """Hotel subtype selection keyboard."""
     buttons = [[InlineKeyboardButton(text=name, callback_data=f"wiz:sub:{code}")] for code, name in HOTEL_SUBTYPES]
@@ -169,6 +173,7 @@ def kb_subtypes() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=None)
 def kb_confirm() -> InlineKeyboardMarkup:
     """Confirmation keyboard."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -179,6 +184,7 @@ def kb_confirm() -> InlineKeyboardMarkup:
     ])
 
 
+@lru_cache(maxsize=None)
 def kb_owner_choice() -> InlineKeyboardMarkup:
     """Owner selection keyboard."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -191,19 +197,26 @@ def kb_my_listings(listings: list[dict]) -> Optional[InlineKeyboardMarkup]:
     """Keyboard for /my_listings."""
     if not listings:
         return None
-    buttons = []
-    for lst in listings[:10]:
-        status = "🟢" if lst["is_active"] else "🔴"
-        title = lst["title"][:18]
-        buttons.append([InlineKeyboardButton(
-            text=f"{status} {title}",
-            callback_data=f"myl:view:{lst['id'][:8]}"
-        )])
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+    return _kb_my_listings(tuple(
+        (lst["id"][:8], lst["title"][:18], lst["is_active"]) for lst in listings[:10]
+    ))
 
 
+@lru_cache(maxsize=128)
+def _kb_my_listings(rows: tuple) -> InlineKeyboardMarkup:
+    """Memoized keyboard keyed by the (short_id, title, is_active) rows it shows."""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(
+            text=f"{'🟢' if is_active else '🔴'} {title}",
+            callback_data=f"myl:view:{lid}"
+        )]
+        for lid, title, is_active in rows
+    ])
+
+
+@lru_cache(maxsize=256)
 def kb_listing_actions(listing_id: str, is_active: bool) -> InlineKeyboardMarkup:
-    """Actions for a single listing."""
+    """Actions for a single listing (memoized per listing + status)."""
     lid = listing_id[:8]
     toggle = "🔴 O'chirish" if is_active else "🟢 Yoqish"
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -256,7 +269,7 @@ async def step_category(callback: CallbackQuery, state: FSMContext):
         )
     else:
         await state.set_state(AddListing.owner)
-        cat_name = dict(CATEGORIES).get(category, category)
+        cat_name = CATEGORY_NAMES.get(category, category)
         await safe_edit(
             callback.message,
             f"✅ Kategoriya: <b>{h(cat_name)}</b>\n\n"
@@ -283,11 +296,10 @@ async def step_title(message: Message, state: FSMContext):
         await safe_send(message, "❌ Nom kamida 3 belgidan iborat bo'lishi kerak:")
         return
     
-    await state.update_data(title=text)
+    data = await state.update_data(title=text)
     await state.set_state(AddListing.description)
     
     # Get category for example
-    data = await state.get_data()
     category = data.get("category", "hotel")
     
     examples = {
@@ -366,9 +378,7 @@ async def step_region(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
     
     region = callback.data.split(":")[2]
-    await state.update_data(region=region)
-    
-    data = await state.get_data()
+    data = await state.update_data(region=region)
     category = data.get("category", "")
     
     # Subtype already selected in Step 2 for hotels
@@ -399,7 +409,7 @@ async def step_hotel_type(callback: CallbackQuery, state: FSMContext):
     await state.update_data(subtype=subtype)
     await state.set_state(AddListing.owner)
 
-    subtype_name = dict(HOTEL_SUBTYPES).get(subtype, subtype)
+    subtype_name = HOTEL_SUBTYPE_NAMES.get(subtype, subtype)
     await safe_edit(
         callback.message,
         f"✅ Turi: <b>{h(subtype_name)}</b>\n\n"
@@ -495,10 +505,9 @@ async def step_phone(message: Message, state: FSMContext):
         return
     
     phone = None if text.lower() == "/skip" else text
-    await state.update_data(phone=phone)
+    data = await state.update_data(phone=phone)
     await state.set_state(AddListing.location)
     
-    data = await state.get_data()
     category = data.get("category", "")
     loc_required = category in LOCATION_REQUIRED
     
@@ -519,11 +528,11 @@ async def step_phone(message: Message, state: FSMContext):
 @listing_wizard_router.message(AddListing.location, F.location)
 async def step_location_received(message: Message, state: FSMContext):
     """Handle location input."""
-    await state.update_data(
+    data = await state.update_data(
         latitude=message.location.latitude,
         longitude=message.location.longitude,
     )
-    await move_to_photos(message, state)
+    await move_to_photos(message, state, data)
 
 
 @listing_wizard_router.message(AddListing.location)
@@ -543,18 +552,18 @@ async def step_location_text(message: Message, state: FSMContext):
         if loc_required:
             await safe_send(message, "❌ Bu kategoriya uchun joylashuv majburiy! Telegram location yuboring:")
             return
-        await state.update_data(latitude=None, longitude=None)
-        await move_to_photos(message, state)
+        data.update(latitude=None, longitude=None)
+        await state.set_data(data)
+        await move_to_photos(message, state, data)
     else:
         skip_hint = " yoki /skip" if not loc_required else ""
         await safe_send(message, f"❌ Telegram location yuboring (📎 tugmasidan){skip_hint}")
 
 
-async def move_to_photos(message: Message, state: FSMContext):
-    """Transition to photos step."""
+async def move_to_photos(message: Message, state: FSMContext, data: dict):
+    """Transition to photos step. `data` is the FSM data just written by the caller."""
     await state.set_state(AddListing.photos)
     
-    data = await state.get_data()
     category = data.get("category", "")
     photos_required = category in PHOTOS_REQUIRED
     
@@ -587,7 +596,9 @@ async def step_photos_received(message: Message, state: FSMContext):
     
     file_id = message.photo[-1].file_id
     photos.append(file_id)
-    await state.update_data(photos=photos)
+    # update_data() would re-read the FSM data we already hold; write it back directly
+    data["photos"] = photos
+    await state.set_data(data)
     
     await safe_send(message, f"✅ Rasm {len(photos)}/{MAX_PHOTOS} qabul qilindi. Yana yuboring yoki /done")
 
@@ -610,28 +621,26 @@ async def step_photos_text(message: Message, state: FSMContext):
         if photos_required and len(photos) < 1:
             await safe_send(message, "❌ Kamida 1 ta rasm yuklang!")
             return
-        await move_to_confirm(message, state)
+        await move_to_confirm(message, state, data)
         return
     
     if text == "/skip":
         if photos_required:
             await safe_send(message, "❌ Bu kategoriya uchun rasmlar majburiy! Kamida 1 ta yuboring.")
             return
-        await move_to_confirm(message, state)
+        await move_to_confirm(message, state, data)
         return
     
     await safe_send(message, "📷 Rasm yuboring yoki /done, /skip buyruqlaridan foydalaning.")
 
 
-async def move_to_confirm(message: Message, state: FSMContext):
-    """Transition to confirmation step."""
+async def move_to_confirm(message: Message, state: FSMContext, data: dict):
+    """Transition to confirmation step. `data` is the caller's current FSM data."""
     await state.set_state(AddListing.confirm)
     
-    data = await state.get_data()
-    
-    cat_name = dict(CATEGORIES).get(data.get("category", ""), data.get("category", ""))
+    cat_name = CATEGORY_NAMES.get(data.get("category", ""), data.get("category", ""))
     subtype = data.get("subtype")
-    subtype_name = dict(HOTEL_SUBTYPES).get(subtype, subtype) if subtype else None
+    subtype_name = HOTEL_SUBTYPE_NAMES.get(subtype, subtype) if subtype else None
     
     lines = ["📋 <b>Tasdiqlash</b>", "", f"📂 Kategoriya: <b>{h(cat_name)}</b>"]
     
@@ -717,8 +726,8 @@ async def step_save(callback: CallbackQuery, state: FSMContext):
 @listing_wizard_router.callback_query(F.data == "wiz:cancel")
 async def cancel_callback(callback: CallbackQuery, state: FSMContext):
     """Cancel via inline button."""
-    await callback.answer()
     await state.clear()
+    ack(callback)
     await safe_edit(callback.message, "❌ Bekor qilindi.")
 
 
@@ -738,30 +747,40 @@ async def cmd_cancel(message: Message, state: FSMContext):
 # /my_listings
 # =============================================================================
 
-@listing_wizard_router.message(Command("my_listings"))
-async def cmd_my_listings(message: Message):
-    """List current user's listings. Admin-only (enforced by router filter)."""
-    user_id = message.from_user.id
-    listings = await db.fetch_listings_by_admin(user_id)
-    
-    if not listings:
-        await safe_send(message, "📭 Sizda hali listinglar yo'q.\n\nYangi qo'shish: /add")
-        return
-    
+def _render_my_listings(listings: list[dict]) -> str:
+    """Text for the /my_listings overview (first 10 listings)."""
     lines = [f"📋 <b>Sizning listinglaringiz</b> ({len(listings)} ta)", ""]
     
-    cat_emoji = {"hotel": "🏨", "guide": "🧑‍💼", "taxi": "🚕", "place": "📍"}
-    
     for lst in listings[:10]:
         status = "🟢" if lst["is_active"] else "🔴"
-        emoji = cat_emoji.get(lst["category"], "📦")
+        emoji = CATEGORY_EMOJI.get(lst["category"], "📦")
         lines.append(f"{status} {emoji} <b>{h(lst['title'])}</b>")
         lines.append(f"   ID: <code>{lst['id'][:8]}</code>")
     
     if len(listings) > 10:
         lines.append(f"\n... va yana {len(listings) - 10} ta")
     
-    await safe_send(message, "\n".join(lines), reply_markup=kb_my_listings(listings))
+    return "\n".join(lines)
+
+
+async def _find_own_listing(callback: CallbackQuery) -> Optional[dict]:
+    """Resolve `myl:<action>:<short_id>` among the caller's own listings."""
+    lid_short = callback.data.split(":")[2]
+    listings = await db.fetch_listings_by_admin_cached(callback.from_user.id)
+    return next((l for l in listings if l["id"].startswith(lid_short)), None)
+
+
+@listing_wizard_router.message(Command("my_listings"))
+async def cmd_my_listings(message: Message):
+    """List current user's listings. Admin-only (enforced by router filter)."""
+    user_id = message.from_user.id
+    listings = await db.fetch_listings_by_admin_cached(user_id)
+    
+    if not listings:
+        await safe_send(message, "📭 Sizda hali listinglar yo'q.\n\nYangi qo'shish: /add")
+        return
+    
+    await safe_send(message, _render_my_listings(listings), reply_markup=kb_my_listings(listings))
 
 
 # =============================================================================
@@ -773,23 +792,18 @@ async def myl_view(callback: CallbackQuery):
     """View a single listing."""
     await callback.answer()
     
-    lid_short = callback.data.split(":")[2]
-    user_id = callback.from_user.id
-    
-    listings = await db.fetch_listings_by_admin(user_id)
-    listing = next((l for l in listings if l["id"].startswith(lid_short)), None)
+    listing = await _find_own_listing(callback)
     
     if not listing:
         await safe_edit(callback.message, "❌ Listing topilmadi.")
         return
     
     status = "🟢 Aktiv" if listing["is_active"] else "🔴 O'chirilgan"
-    cat_names = {"hotel": "Mehmonxona", "guide": "Gid", "taxi": "Taxi", "place": "Joy"}
     
     lines = [
         f"📌 <b>{h(listing['title'])}</b>",
         "",
-        f"📂 {cat_names.get(listing['category'], listing['category'])}",
+        f"📂 {CATEGORY_PLAIN_NAMES.get(listing['category'], listing['category'])}",
         f"📊 {status}",
     ]
     
@@ -818,11 +832,7 @@ async def myl_toggle(callback: CallbackQuery):
     """Toggle listing active status."""
     await callback.answer()
     
-    lid_short = callback.data.split(":")[2]
-    user_id = callback.from_user.id
-    
-    listings = await db.fetch_listings_by_admin(user_id)
-    listing = next((l for l in listings if l["id"].startswith(lid_short)), None)
+    listing = await _find_own_listing(callback)
     
     if not listing:
         await safe_edit(callback.message, "❌ Listing topilmadi.")
@@ -866,11 +876,7 @@ async def myl_delete_execute(callback: CallbackQuery):
     """Execute deletion."""
     await callback.answer()
     
-    lid_short = callback.data.split(":")[2]
-    user_id = callback.from_user.id
-    
-    listings = await db.fetch_listings_by_admin(user_id)
-    listing = next((l for l in listings if l["id"].startswith(lid_short)), None)
+    listing = await _find_own_listing(callback)
     
     if not listing:
         await safe_edit(callback.message, "❌ Listing topilmadi.")
@@ -890,20 +896,10 @@ async def myl_back(callback: CallbackQuery):
     await callback.answer()
     
     user_id = callback.from_user.id
-    listings = await db.fetch_listings_by_admin(user_id)
+    listings = await db.fetch_listings_by_admin_cached(user_id)
     
     if not listings:
         await safe_edit(callback.message, "📭 Listinglar yo'q.")
         return
     
-    lines = [f"📋 <b>Sizning listinglaringiz</b> ({len(listings)} ta)", ""]
-    
-    cat_emoji = {"hotel": "🏨", "guide": "🧑‍💼", "taxi": "🚕", "place": "📍"}
-    
-    for lst in listings[:10]:
-        status = "🟢" if lst["is_active"] else "🔴"
-        emoji = cat_emoji.get(lst["category"], "📦")
-        lines.append(f"{status} {emoji} <b>{h(lst['title'])}</b>")
-        lines.append(f"   ID: <code>{lst['id'][:8]}</code>")
-    
-    await safe_edit(callback.message, "\n".join(lines), reply_markup=kb_my_listings(listings))
+    await safe_edit(callback.message, _render_my_listings(listings), reply_markup=kb_my_listings(listings))
@@ -8,9 +8,11 @@ Features:
 - Booking FSM (name → phone → date → note → confirm)
 """
 
-import html
+import asyncio
 import logging
 import re
+import time
+from functools import lru_cache
 from typing import Optional
 
 from aiogram import Router, Bot, F
@@ -26,6 +28,7 @@ from aiogram.filters import Command, StateFilter, BaseFilter
 from aiogram.exceptions import TelegramBadRequest
 
 import db_postgres as db
+from utils import ack, h
 
 
 
@@ -94,9 +97,9 @@ async def process_contact_fallback(message: Message):
 @user_flow_router.message(StateFilter(Registration.first_name))
 async def process_first_name(message: Message, state: FSMContext):
     """Handle first name input."""
-    name = (message.text or "").strip()
+    name = _text_input(message, 2)
     
-    if not message.text or not name or len(name) < 2:
+    if name is None:
         await message.answer("❌ Ism matn bo'lishi va kamida 2 harfdan iborat bo'lishi kerak:")
         return
         
@@ -109,9 +112,9 @@ async def process_first_name(message: Message, state: FSMContext):
 @user_flow_router.message(StateFilter(Registration.last_name))
 async def process_last_name(message: Message, state: FSMContext):
     """Handle last name input and save to DB."""
-    last_name = (message.text or "").strip()
+    last_name = _text_input(message, 2)
     
-    if not message.text or not last_name or len(last_name) < 2:
+    if last_name is None:
         await message.answer("❌ Familya matn bo'lishi va kamida 2 harfdan iborat bo'lishi kerak:")
         return
         
@@ -130,20 +133,16 @@ async def process_last_name(message: Message, state: FSMContext):
         
     await state.clear()
     
-    # Send success message + normal /start menu
-    await message.answer(
-        f"✅ <b>Ro'yxatdan o'tdingiz!</b>\n\n"
+    # Success message + normal /start menu, sent as a single message
+    await show_main_menu(
+        message,
+        header=f"✅ <b>Ro'yxatdan o'tdingiz!</b>\n\n"
         f"Xush kelibsiz, {h(first_name)} {h(last_name)}!",
-        parse_mode="HTML"
     )
-    
-    # Continue normal flow (show menu)
-    # We call the logic that normally serves /start here manually
-    await show_main_menu(message)
 
 
-async def show_main_menu(message: Message):
-    """Show the main menu (used after registration or login)."""
+async def show_main_menu(message: Message, header: Optional[str] = None):
+    """Show the main menu (used after registration or login), optionally under a header."""
     # Logic copied from main.py's cmd_start to avoid circular import issues
     # But since main.py defines it, and we are in listings_user_flow.py,
     # we can't easily call main.py's function.
@@ -153,7 +152,8 @@ async def show_main_menu(message: Message):
     from config import ADMINS
     user_id = message.from_user.id
     
-    lines = [
+    lines = [header, ""] if header else []
+    lines += [
         "Assalomu alaykum! <b>SafarTrip.uz</b> botiga xush kelibsiz.",
         "",
         "📍 <b>Hudud:</b> Zomin",
@@ -168,14 +168,13 @@ async def show_main_menu(message: Message):
 
 
 # =============================================================================
-# HTML Safety
+# Message Helpers
 # =============================================================================
 
-def h(text) -> str:
-    """HTML-escape any value."""
-    if text is None:
-        return ""
-    return html.escape(str(text), quote=False)
+def _text_input(message: Message, min_len: int = 1) -> Optional[str]:
+    """Stripped message text, or None if missing/shorter than min_len."""
+    text = (message.text or "").strip()
+    return text if len(text) >= min_len else None
 
 
 async def safe_send(message: Message, text: str, reply_markup=None, **kwargs) -> Message:
@@ -193,9 +192,10 @@ async def safe_edit(message: Message, text: str, reply_markup=None) -> Optional[
     try:
         return await message.edit_text(text, parse_mode="HTML", reply_markup=reply_markup)
     except TelegramBadRequest as e:
-        if "can't parse entities" in str(e).lower():
+        err = str(e).lower()
+        if "can't parse entities" in err:
             return await message.edit_text(text, parse_mode=None, reply_markup=reply_markup)
-        if "message is not modified" in str(e).lower():
+        if "message is not modified" in err:
             return message
         raise
 
@@ -252,11 +252,54 @@ HOTEL_SUBTYPES = [
     ("dacha", "Dacha"),
 ]
 
+# Booking date: "15-fevral", "15-20 fevral", "15 iyundan", "15.02", "15.02.2026",
+# "2026-02-15", "28 fevral - 2 mart", "15-fevraldan 17-fevralgacha"
+# (Uzbek Latin / Cyrillic or Russian month names, numeric or ISO dates)
+_DAY = r"(?:0?[1-9]|[12]\d|3[01])"
+_MONTH_NUM = r"(?:0?[1-9]|1[0-2])"
+_MONTH_NAME = (
+    r"(?:yanvar|fevral|mart|aprel|may|iyun|iyul|avgust|sent(?:y)?abr|okt(?:y)?abr|noyabr|dekabr"
+    r"|(?:январ|феврал|апрел|июн|июл|сентябр|октябр|ноябр|декабр)[ья]?|марта?|ма[йя]|августа?)"
+    r"(?:-?(?:dan|gacha|da|дан|гача|да))?"
+)
+_DATE_PART = (
+    rf"(?:{_DAY}(?:\s*[-–]\s*{_DAY})?[\s-]*{_MONTH_NAME}(?:\s+\d{{4}})?"
+    rf"|{_DAY}(?:\s*[-–]\s*{_DAY})?[./]{_MONTH_NUM}(?:[./](?:\d{{4}}|\d{{2}}))?"
+    rf"|\d{{4}}-{_MONTH_NUM}-{_DAY})"
+)
+DATE_RE = re.compile(rf"^{_DATE_PART}(?:(?:\s*[-–]\s*|\s+){_DATE_PART})?$", re.IGNORECASE)
+
+NO_LISTINGS_TEXT = "📭 Afsuski, bu kategoriyada hozircha listinglar yo'q."
+
+BOOKING_START_TEMPLATE = (
+    "📝 <b>Bron qilish</b>\n\n"
+    "📌 {title}\n\n"
+    "👥 Necha kishi bo'lasiz? (1-10)\n"
+    "<i>1 kishi bo'lsa, ismingiz avtomatik qo'shiladi.</i>"
+)
+
+BOOKING_CONFIRM_TEMPLATE = (
+    "📋 <b>Bronni tasdiqlang</b>\n\n"
+    "📌 {title}{price_line}\n\n"
+    "👥 Mehmonlar ({guest_count}): {names}\n"
+    "📱 Telefon: {phone}\n"
+    "📅 Sana: {date}"
+    "{note_line}"
+)
+
+BOOKING_SENT_TEMPLATE = (
+    "✅ <b>Bron yuborildi!</b>\n\n"
+    "📌 {title}\n\n"
+    "⏳ 5 daqiqa ichida javob keladi.\n"
+    "Agar javob kelmasa, keyinroq urinib ko'ring."
+)
+
 
 # =============================================================================
 # Keyboards
 # =============================================================================
 
+@lru_cache(maxsize=None)
 def kb_regions() -> InlineKeyboardMarkup:
     """Region selection."""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -264,6 +307,7 @@ def kb_regions() -> InlineKeyboardMarkup:
     ])
 
 
+@lru_cache(maxsize=None)
 def kb_contact() -> ReplyKeyboardMarkup:
     """Request contact keyboard."""
     return ReplyKeyboardMarkup(
@@ -275,6 +319,13 @@ def kb_contact() -> ReplyKeyboardMarkup:
 
 def build_main_menu(user_id: int) -> ReplyKeyboardMarkup:
     """Main menu keyboard (dynamic for admins)."""
+    from config import ADMINS
+    return _main_menu(user_id in ADMINS)
+
+
+@lru_cache(maxsize=None)
+def _main_menu(is_admin: bool) -> ReplyKeyboardMarkup:
+    """Build (and memoize) the user or admin main menu."""
     # Base user buttons
     rows = [
         [KeyboardButton(text="🧭 Sayohatni boshlash"), KeyboardButton(text="📍 Hudud")],
@@ -282,8 +333,7 @@ def build_main_menu(user_id: int) -> ReplyKeyboardMarkup:
     ]
     
     # Admin buttons
-    from config import ADMINS
-    if user_id in ADMINS:
+    if is_admin:
         rows.append([KeyboardButton(text="➕ Listing qo'shish")])
         rows.append([KeyboardButton(text="🗂 Mening listinglarim")])
         
@@ -294,6 +344,7 @@ def build_main_menu(user_id: int) -> ReplyKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=None)
 def kb_categories() -> InlineKeyboardMarkup:
     """Category selection."""
     buttons = [[InlineKeyboardButton(text=name, callback_data=f"uf:cat:{code}")] for code, name in CATEGORIES]
@@ -301,6 +352,7 @@ def kb_categories() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=None)
 def kb_subtypes() -> InlineKeyboardMarkup:
     """Hotel subtype selection."""
     buttons = [[InlineKeyboardButton(text=name, callback_data=f"uf:sub:{code}")] for code, name in HOTEL_SUBTYPES]
@@ -310,7 +362,12 @@ def kb_subtypes() -> InlineKeyboardMarkup:
 
 def kb_listing_card(listing: dict, index: int, total: int) -> InlineKeyboardMarkup:
     """Card buttons for a single listing."""
-    lid = listing["id"][:8]
+    return _kb_listing_card(listing["id"][:8], bool(listing.get("latitude")), index, total)
+
+
+@lru_cache(maxsize=1024)
+def _kb_listing_card(lid: str, has_location: bool, index: int, total: int) -> InlineKeyboardMarkup:
+    """Build (and memoize) card buttons. Markup is shared - never mutate it."""
     buttons = [
         [
             InlineKeyboardButton(text="✅ Tanlash", callback_data=f"uf:pick:{lid}"),
@@ -318,7 +375,7 @@ def kb_listing_card(listing: dict, index: int, total: int) -> InlineKeyboardMark
     ]
     
     # Location button only if coordinates exist
-    if listing.get("latitude"):
+    if has_location:
         buttons[0].append(InlineKeyboardButton(text="📍 Lokatsiya", callback_data=f"uf:loc:{lid}"))
     
     # Pagination
@@ -350,6 +407,15 @@ def kb_detail(listing: dict) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=None)
+def kb_back_to_category() -> InlineKeyboardMarkup:
+    """Back button for an empty category."""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="⬅️ Orqaga", callback_data="uf:back:category")]
+    ])
+
+
+@lru_cache(maxsize=None)
 def kb_phone_choice() -> ReplyKeyboardMarkup:
     """Phone choice: use registered or enter new."""
     return ReplyKeyboardMarkup(
@@ -361,8 +427,9 @@ def kb_phone_choice() -> ReplyKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=1024)
 def kb_booking_confirm(listing_id: str) -> InlineKeyboardMarkup:
-    """Booking confirmation buttons."""
+    """Booking confirmation buttons (memoized per listing)."""
     return InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text="✅ Tasdiqlash", callback_data=f"uf:bconfirm:{listing_id[:8]}"),
@@ -376,8 +443,6 @@ def kb_booking_confirm(listing_id: str) -> InlineKeyboardMarkup:
 # =============================================================================
 
 @user_flow_router.message(Command("browse"))
-@user_flow_router.message(F.text == "🧭 Sayohatni boshlash")
-@user_flow_router.message(F.text == "🔍 Qidirish") # Legacy support
 async def cmd_browse(message: Message, state: FSMContext):
     """Start browsing flow."""
     await state.clear()
@@ -395,8 +460,7 @@ async def cmd_browse(message: Message, state: FSMContext):
     )
 
 
-@user_flow_router.message(F.text == "📍 Hudud")
-async def cmd_hudud_btn(message: Message):
+async def cmd_hudud_btn(message: Message, state: FSMContext):
     """Handle 📍 Hudud button."""
     await safe_send(
         message,
@@ -405,8 +469,7 @@ async def cmd_hudud_btn(message: Message):
     )
 
 
-@user_flow_router.message(F.text == "❓ Yordam")
-async def cmd_help_btn(message: Message):
+async def cmd_help_btn(message: Message, state: FSMContext):
     """Handle Help button (triggers main help)."""
     # Since cmd_help is in main.py, we just show a simple help text here 
     # to avoid circular imports or complex routing.
@@ -422,7 +485,6 @@ async def cmd_help_btn(message: Message):
     )
     
     
-@user_flow_router.message(F.text == "➕ Listing qo'shish")
 async def cmd_add_btn(message: Message, state: FSMContext):
     """Trigger listing wizard (Admin only)."""
     # Check admin
@@ -434,12 +496,11 @@ async def cmd_add_btn(message: Message, state: FSMContext):
     # Since wizard router is separate, but we are all in same dispatcher...
     # We can't easily call the function across routers without importing.
     # We will import it inside here to avoid top-level circular dep.
-    from listing_wizard import start_add_listing
-    await start_add_listing(message, state)
+    from listing_wizard import cmd_add
+    await cmd_add(message, state)
 
 
-@user_flow_router.message(F.text == "🗂 Mening listinglarim")
-async def cmd_my_listings_btn(message: Message):
+async def cmd_my_listings_btn(message: Message, state: FSMContext):
     """Trigger my listings (Admin only)."""
     from config import ADMINS
     if message.from_user.id not in ADMINS:
@@ -449,6 +510,23 @@ async def cmd_my_listings_btn(message: Message):
     await cmd_my_listings(message)
 
 
+# Reply-keyboard button text -> handler (one filter, O(1) dispatch)
+MAIN_MENU_ACTIONS = {
+    "🧭 Sayohatni boshlash": cmd_browse,
+    "🔍 Qidirish": cmd_browse,  # Legacy support
+    "📍 Hudud": cmd_hudud_btn,
+    "❓ Yordam": cmd_help_btn,
+    "➕ Listing qo'shish": cmd_add_btn,
+    "🗂 Mening listinglarim": cmd_my_listings_btn,
+}
+
+
+@user_flow_router.message(F.text.in_(MAIN_MENU_ACTIONS))
+async def main_menu_button(message: Message, state: FSMContext):
+    """Route main menu button presses."""
+    await MAIN_MENU_ACTIONS[message.text](message, state)
+
+
 @user_flow_router.message(StateFilter(None), F.text)
 async def handle_unknown_text(message: Message):
     """Fallback for unknown text messages (ONLY when no FSM state is active)."""
@@ -469,12 +547,11 @@ async def handle_unknown_text(message: Message):
 @user_flow_router.callback_query(F.data.startswith("uf:region:"))
 async def select_region(callback: CallbackQuery, state: FSMContext):
     """Handle region selection."""
-    await callback.answer()
-    
     region = callback.data.split(":")[2]
     await state.update_data(region=region)
     await state.set_state(BrowseState.category)
     
+    ack(callback)
     await safe_edit(
         callback.message,
         f"🗺 Hudud: <b>Zomin</b>\n\nBoshqa viloyatlar va shaharlar bosqichma-bosqich qo'shib boriladi.\n\n📂 Kategoriyani tanlang:",
@@ -489,7 +566,7 @@ async def select_region(callback: CallbackQuery, state: FSMContext):
 @user_flow_router.callback_query(F.data.startswith("uf:cat:"))
 async def select_category(callback: CallbackQuery, state: FSMContext):
     """Handle category selection."""
-    await callback.answer()
+    ack(callback)
     
     category = callback.data.split(":")[2]
     await state.update_data(category=category)
@@ -513,7 +590,7 @@ async def select_category(callback: CallbackQuery, state: FSMContext):
 @user_flow_router.callback_query(F.data.startswith("uf:sub:"))
 async def select_subtype(callback: CallbackQuery, state: FSMContext):
     """Handle subtype selection for hotels."""
-    await callback.answer()
+    ack(callback)
     
     subtype = callback.data.split(":")[2]
     await state.update_data(subtype=subtype)
@@ -534,16 +611,10 @@ async def show_listings(message: Message, state: FSMContext, user_id: int, index
     category = data.get("category")
     subtype = data.get("subtype")
     
-    listings = await db.fetch_listings(region=region, category=category, subtype=subtype)
+    listings = await db.fetch_listings_cached(region=region, category=category, subtype=subtype)
     
     if not listings:
-        await safe_edit(
-            message,
-            "📭 Afsuski, bu kategoriyada hozircha listinglar yo'q.",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="⬅️ Orqaga", callback_data="uf:back:category")]
-            ]),
-        )
+        await safe_edit(message, NO_LISTINGS_TEXT, reply_markup=kb_back_to_category())
         return
     
     await state.update_data(listings=[l["id"] for l in listings], current_index=index)
@@ -555,6 +626,14 @@ async def show_listings(message: Message, state: FSMContext, user_id: int, index
     await send_listing_card(message, listing, index, len(listings))
 
 
+async def _delete_quietly(message: Message) -> None:
+    """Delete a message, ignoring 'already deleted' / 'too old' errors."""
+    try:
+        await message.delete()
+    except Exception:
+        pass
+
+
 async def send_listing_card(message: Message, listing: dict, index: int, total: int):
     """Send a single listing as a photo card."""
     photos = listing.get("photos", [])
@@ -570,6 +649,8 @@ async def send_listing_card(message: Message, listing: dict, index: int, total:
         lines.append(f"📝 {h(desc[:80] + '...' if len(desc) > 80 else desc)}")
     
     lines.append(f"\n📊 {index + 1}/{total}")
+    if not photos:
+        lines.append("\n📷 Rasm yo'q")
     
     caption = "\n".join(lines)
     keyboard = kb_listing_card(listing, index, total)
@@ -577,22 +658,20 @@ async def send_listing_card(message: Message, listing: dict, index: int, total:
     if photos:
         # Send first photo as card
         try:
-            # Delete previous message first
-            try:
-                await message.delete()
-            except:
-                pass
-            
             # Get the bot from message
             bot = message.bot
             chat_id = message.chat.id
             
-            await bot.send_photo(
-                chat_id=chat_id,
-                photo=photos[0],
-                caption=caption,
-                parse_mode="HTML",
-                reply_markup=keyboard,
+            # Delete previous message while the new card is being sent
+            await asyncio.gather(
+                _delete_quietly(message),
+                bot.send_photo(
+                    chat_id=chat_id,
+                    photo=photos[0],
+                    caption=caption,
+                    parse_mode="HTML",
+                    reply_markup=keyboard,
+                ),
             )
         except TelegramBadRequest as e:
             if "can't parse entities" in str(e).lower():
@@ -614,11 +693,11 @@ async def send_listing_card(message: Message, listing: dict, index: int, total:
     else:
         # No photo, send text message
         try:
-            await message.edit_text(caption + "\n\n📷 Rasm yo'q", parse_mode="HTML", reply_markup=keyboard)
+            await message.edit_text(caption, parse_mode="HTML", reply_markup=keyboard)
         except:
             await message.bot.send_message(
                 chat_id=message.chat.id,
-                text=caption + "\n\n📷 Rasm yo'q",
+                text=caption,
                 parse_mode="HTML",
                 reply_markup=keyboard,
             )
@@ -631,7 +710,7 @@ async def send_listing_card(message: Message, listing: dict, index: int, total:
 @user_flow_router.callback_query(F.data.startswith("uf:page:"))
 async def paginate_listings(callback: CallbackQuery, state: FSMContext):
     """Handle pagination."""
-    await callback.answer()
+    ack(callback)
     
     index = int(callback.data.split(":")[2])
     data = await state.get_data()
@@ -640,7 +719,7 @@ async def paginate_listings(callback: CallbackQuery, state: FSMContext):
     if not listing_ids or index >= len(listing_ids):
         return
     
-    listing = await db.get_listing(listing_ids[index])
+    listing = await db.get_listing_cached(listing_ids[index])
     if listing:
         await state.update_data(current_index=index)
         await send_listing_card(callback.message, listing, index, len(listing_ids))
@@ -650,27 +729,37 @@ async def paginate_listings(callback: CallbackQuery, state: FSMContext):
 # Pick Listing (Detail View)
 # =============================================================================
 
-@user_flow_router.callback_query(F.data.startswith("uf:pick:"))
-async def pick_listing(callback: CallbackQuery, state: FSMContext):
-    """Show listing detail view."""
-    await callback.answer()
-    
+async def _resolve_listing(callback: CallbackQuery, state: FSMContext) -> Optional[dict]:
+    """
+    Resolve `uf:<action>:<short_id>` to a listing.
+    Looks in the browsed ids first, then the selected listing; alerts if not found.
+    """
     lid_short = callback.data.split(":")[2]
     data = await state.get_data()
-    listing_ids = data.get("listings", [])
+    listing_ids = data.get("listings") or []
     
-    # Find full ID
     full_id = next((lid for lid in listing_ids if lid.startswith(lid_short)), None)
     if not full_id:
-        await callback.answer("Listing topilmadi", show_alert=True)
-        return
+        selected = data.get("selected_listing")
+        if selected and selected.startswith(lid_short):
+            full_id = selected
     
-    listing = await db.get_listing(full_id)
+    listing = await db.get_listing_cached(full_id) if full_id else None
     if not listing:
         await callback.answer("Listing topilmadi", show_alert=True)
+        return None
+    return listing
+
+
+@user_flow_router.callback_query(F.data.startswith("uf:pick:"))
+async def pick_listing(callback: CallbackQuery, state: FSMContext):
+    """Show listing detail view."""
+    listing = await _resolve_listing(callback, state)
+    if not listing:
         return
+    ack(callback)
     
-    await state.update_data(selected_listing=full_id)
+    await state.update_data(selected_listing=listing["id"])
     
     photos = listing.get("photos", [])
     
@@ -696,30 +785,29 @@ async def pick_listing(callback: CallbackQuery, state: FSMContext):
     detail_text = "\n".join(lines)
     keyboard = kb_detail(listing)
     
-    try:
-        await callback.message.delete()
-    except:
-        pass
-    
     bot = callback.message.bot
     chat_id = callback.message.chat.id
     
-    # Send media group if multiple photos
-    if len(photos) > 1:
-        media = [InputMediaPhoto(media=p) for p in photos[:10]]
-        try:
-            await bot.send_media_group(chat_id=chat_id, media=media)
-        except:
-            # If media group fails, send first photo only
-            if photos:
-                await bot.send_photo(chat_id=chat_id, photo=photos[0])
-        
-        # Send detail text separately
-        await bot.send_message(chat_id=chat_id, text=detail_text, parse_mode="HTML", reply_markup=keyboard)
-    elif len(photos) == 1:
-        await bot.send_photo(chat_id=chat_id, photo=photos[0], caption=detail_text, parse_mode="HTML", reply_markup=keyboard)
-    else:
-        await bot.send_message(chat_id=chat_id, text=detail_text, parse_mode="HTML", reply_markup=keyboard)
+    async def send_detail():
+        # Send media group if multiple photos
+        if len(photos) > 1:
+            media = [InputMediaPhoto(media=p) for p in photos[:10]]
+            try:
+                await bot.send_media_group(chat_id=chat_id, media=media)
+            except:
+                # If media group fails, send first photo only
+                if photos:
+                    await bot.send_photo(chat_id=chat_id, photo=photos[0])
+            
+            # Send detail text separately (after the album, so order is kept)
+            await bot.send_message(chat_id=chat_id, text=detail_text, parse_mode="HTML", reply_markup=keyboard)
+        elif len(photos) == 1:
+            await bot.send_photo(chat_id=chat_id, photo=photos[0], caption=detail_text, parse_mode="HTML", reply_markup=keyboard)
+        else:
+            await bot.send_message(chat_id=chat_id, text=detail_text, parse_mode="HTML", reply_markup=keyboard)
+    
+    # Removing the card doesn't need to finish before the detail goes out
+    await asyncio.gather(_delete_quietly(callback.message), send_detail())
 
 
 # =============================================================================
@@ -729,29 +817,15 @@ async def pick_listing(callback: CallbackQuery, state: FSMContext):
 @user_flow_router.callback_query(F.data.startswith("uf:loc:"))
 async def send_location(callback: CallbackQuery, state: FSMContext):
     """Send listing location."""
-    await callback.answer()
-    
-    lid_short = callback.data.split(":")[2]
-    data = await state.get_data()
-    listing_ids = data.get("listings", [])
-    
-    full_id = next((lid for lid in listing_ids if lid.startswith(lid_short)), None)
-    if not full_id:
-        full_id = data.get("selected_listing")
-    
-    if not full_id:
-        await callback.answer("Listing topilmadi", show_alert=True)
-        return
-    
-    listing = await db.get_listing(full_id)
+    listing = await _resolve_listing(callback, state)
     if not listing:
-        await callback.answer("Listing topilmadi", show_alert=True)
         return
     
     lat = listing.get("latitude")
     lon = listing.get("longitude")
     
     if lat and lon:
+        ack(callback)
         bot = callback.message.bot
         chat_id = callback.message.chat.id
         
@@ -770,9 +844,9 @@ async def send_location(callback: CallbackQuery, state: FSMContext):
 @user_flow_router.callback_query(F.data == "uf:back:region")
 async def back_to_region(callback: CallbackQuery, state: FSMContext):
     """Go back to region selection."""
-    await callback.answer()
     await state.set_state(BrowseState.region)
     
+    ack(callback)
     await safe_edit(
         callback.message,
         "<b>Qaysi hududga bormoqchisiz?</b>",
@@ -783,53 +857,70 @@ async def back_to_region(callback: CallbackQuery, state: FSMContext):
 @user_flow_router.callback_query(F.data == "uf:back:category")
 async def back_to_category(callback: CallbackQuery, state: FSMContext):
     """Go back to category selection."""
-    await callback.answer()
     await state.update_data(subtype=None, listings=None, current_index=0)
     await state.set_state(BrowseState.category)
     
-    try:
-        await callback.message.delete()
-    except:
-        pass
-    
-    await callback.message.bot.send_message(
-        chat_id=callback.message.chat.id,
-        text="📂 Kategoriyani tanlang:",
-        parse_mode="HTML",
-        reply_markup=kb_categories(),
+    # Toast, delete and the new prompt are independent Telegram calls
+    results = await asyncio.gather(
+        callback.answer(),
+        _delete_quietly(callback.message),
+        callback.message.bot.send_message(
+            chat_id=callback.message.chat.id,
+            text="📂 Kategoriyani tanlang:",
+            parse_mode="HTML",
+            reply_markup=kb_categories(),
+        ),
+        return_exceptions=True,
     )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"back_to_category: {result}")
 
 
 @user_flow_router.callback_query(F.data == "uf:back:list")
 async def back_to_list(callback: CallbackQuery, state: FSMContext):
     """Go back to listings."""
-    await callback.answer()
-    
     data = await state.get_data()
     index = data.get("current_index", 0)
-    listing_ids = data.get("listings", [])
+    listing_ids = data.get("listings") or []
     
+    listing = None
     if listing_ids and index < len(listing_ids):
-        listing = await db.get_listing(listing_ids[index])
-        if listing:
-            try:
-                await callback.message.delete()
-            except:
-                pass
-            
-            # Need to send as new message
-            await callback.message.bot.send_photo(
-                chat_id=callback.message.chat.id,
-                photo=listing["photos"][0] if listing.get("photos") else None,
-                caption=f"<b>{h(listing['title'])}</b>\n📊 {index + 1}/{len(listing_ids)}",
-                parse_mode="HTML",
-                reply_markup=kb_listing_card(listing, index, len(listing_ids)),
-            ) if listing.get("photos") else await callback.message.bot.send_message(
-                chat_id=callback.message.chat.id,
-                text=f"<b>{h(listing['title'])}</b>\n📊 {index + 1}/{len(listing_ids)}",
-                parse_mode="HTML",
-                reply_markup=kb_listing_card(listing, index, len(listing_ids)),
-            )
+        listing = await db.get_listing_cached(listing_ids[index])
+    if not listing:
+        await callback.answer()
+        return
+    
+    bot = callback.message.bot
+    chat_id = callback.message.chat.id
+    caption = f"<b>{h(listing['title'])}</b>\n📊 {index + 1}/{len(listing_ids)}"
+    keyboard = kb_listing_card(listing, index, len(listing_ids))
+    
+    # Need to send as new message; answer and delete the old one meanwhile
+    if listing.get("photos"):
+        send = bot.send_photo(
+            chat_id=chat_id,
+            photo=listing["photos"][0],
+            caption=caption,
+            parse_mode="HTML",
+            reply_markup=keyboard,
+        )
+    else:
+        send = bot.send_message(
+            chat_id=chat_id,
+            text=caption,
+            parse_mode="HTML",
+            reply_markup=keyboard,
+        )
+    results = await asyncio.gather(
+        callback.answer(),
+        _delete_quietly(callback.message),
+        send,
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"back_to_list: {result}")
 
 
 # =============================================================================
@@ -839,35 +930,17 @@ async def back_to_list(callback: CallbackQuery, state: FSMContext):
 @user_flow_router.callback_query(F.data.startswith("uf:book:"))
 async def start_booking(callback: CallbackQuery, state: FSMContext):
     """Start booking form."""
-    await callback.answer()
-    
-    lid_short = callback.data.split(":")[2]
-    data = await state.get_data()
-    listing_ids = data.get("listings", [])
-    
-    full_id = next((lid for lid in listing_ids if lid.startswith(lid_short)), None)
-    if not full_id:
-        full_id = data.get("selected_listing")
-    
-    if not full_id:
-        await callback.answer("Listing topilmadi", show_alert=True)
-        return
-    
-    listing = await db.get_listing(full_id)
+    listing = await _resolve_listing(callback, state)
     if not listing:
-        await callback.answer("Listing topilmadi", show_alert=True)
         return
+    ack(callback)
     
-    await state.update_data(booking_listing_id=full_id, booking_listing=listing)
+    # Title is constant for the whole form: escape it once and keep it in state
+    title_html = h(listing["title"])
+    await state.update_data(booking_listing_id=listing["id"], booking_title_html=title_html)
     await state.set_state(BookingForm.guest_count)
     
-    await safe_edit(
-        callback.message,
-        f"📝 <b>Bron qilish</b>\n\n"
-        f"📌 {h(listing['title'])}\n\n"
-        f"👥 Necha kishi bo'lasiz? (1-10)\n"
-        f"<i>1 kishi bo'lsa, ismingiz avtomatik qo'shiladi.</i>",
-    )
+    await safe_edit(callback.message, BOOKING_START_TEMPLATE.format_map({"title": title_html}))
 
 
 @user_flow_router.message(BookingForm.guest_count)
@@ -897,15 +970,15 @@ async def booking_guest_count(message: Message, state: FSMContext):
     
     if guest_count == 1:
         # Auto-fill: only the registered user
-        await state.update_data(
-            guest_count=1,
-            guest_names=[registered_name],
-        )
         await safe_send(
             message,
             f"✅ Mehmon: <b>{h(registered_name)}</b> (avtomatik)",
         )
-        await _ask_phone_step(message, state)
+        await _ask_phone_step(
+            message, state, user,
+            guest_count=1,
+            guest_names=[registered_name],
+        )
     else:
         # guest_count >= 2: registered user is Guest #1
         remaining = guest_count - 1
@@ -969,14 +1042,12 @@ async def booking_extra_names(message: Message, state: FSMContext):
     # Build full guest list: registered user first
     guest_names = [registered_name] + names
     
-    await state.update_data(guest_names=guest_names)
-    
     names_display = ", ".join(h(n) for n in guest_names)
     await safe_send(
         message,
         f"✅ Mehmonlar ({guest_count}): <b>{names_display}</b>",
     )
-    await _ask_phone_step(message, state)
+    await _ask_phone_step(message, state, guest_names=guest_names)
 
 
 # -----------------------------------------------------------------------------
@@ -996,15 +1067,20 @@ def _normalize_uz_phone(raw: str) -> str | None:
     return None
 
 
-async def _ask_phone_step(message: Message, state: FSMContext):
-    """Shared helper: offer registered phone or ask for manual input."""
+async def _ask_phone_step(message: Message, state: FSMContext, user: Optional[dict] = None, **fields):
+    """
+    Shared helper: offer registered phone or ask for manual input.
+    Pending form `fields` are written together with the phone in one FSM update;
+    pass `user` when the caller already fetched it to skip a DB round-trip.
+    """
     user_id = message.from_user.id
-    user = await db.get_user_by_telegram_id(user_id)
+    if user is None:
+        user = await db.get_user_by_telegram_id(user_id)
     user_phone = (user.get("phone") or "").strip() if user else ""
-    logger.info(f"ask_phone_step user={user_id} phone={user_phone!r}")
+    logger.debug("ask_phone_step user=%s has_phone=%s", user_id, bool(user_phone))
 
     if user_phone:
-        await state.update_data(registered_phone=user_phone)
+        await state.update_data(registered_phone=user_phone, **fields)
         await state.set_state(BookingForm.phone_choice)
         await safe_send(
             message,
@@ -1014,6 +1090,8 @@ async def _ask_phone_step(message: Message, state: FSMContext):
         )
     else:
         # No registered phone — request contact share
+        if fields:
+            await state.update_data(**fields)
         await state.set_state(BookingForm.phone_manual)
         await safe_send(
             message,
@@ -1029,7 +1107,9 @@ async def booking_phone_use_registered(message: Message, state: FSMContext):
     data = await state.get_data()
     phone = data.get("registered_phone", "")
     
-    await state.update_data(booking_phone=phone)
+    # update_data() would re-read the FSM data we already hold; write it back directly
+    data["booking_phone"] = phone
+    await state.set_data(data)
     await state.set_state(BookingForm.date)
     
     await safe_send(
@@ -1116,10 +1196,10 @@ async def booking_phone_manual(message: Message, state: FSMContext):
 @user_flow_router.message(BookingForm.date)
 async def booking_date(message: Message, state: FSMContext):
     """Collect date."""
-    date = (message.text or "").strip()
+    date = _text_input(message)
     
-    if not date:
-        await safe_send(message, "❌ Sanani kiriting:")
+    if date is None or not DATE_RE.match(date):
+        await safe_send(message, "❌ Sanani to'g'ri kiriting (masalan: '15-fevral' yoki '15-20 fevral'):")
         return
     
     await state.update_data(booking_date=date)
@@ -1138,59 +1218,93 @@ async def booking_note(message: Message, state: FSMContext):
     text = (message.text or "").strip()
     
     note = None if text.lower() == "/skip" else text
-    await state.update_data(booking_note=note)
+    data = await state.update_data(booking_note=note)
     await state.set_state(BookingForm.confirm)
     
-    data = await state.get_data()
-    listing = data.get("booking_listing", {})
+    listing_id = data.get("booking_listing_id", "")
+    listing = await db.get_listing_cached(listing_id) or {}
+    title_html = data.get("booking_title_html") or h(listing.get("title", ""))
     
     guest_count = data.get("guest_count", 1)
     guest_names = data.get("guest_names", [])
     names_display = ", ".join(h(n) for n in guest_names) if guest_names else "—"
     
-    lines = [
-        "📋 <b>Bronni tasdiqlang</b>",
-        "",
-        f"📌 {h(listing.get('title', ''))}",
-    ]
-    
-    if listing.get("price_from"):
-        lines.append(f"💰 {listing['price_from']:,} {listing.get('currency', 'UZS')}")
-    
-    lines.extend([
-        "",
-        f"👥 Mehmonlar ({guest_count}): {names_display}",
-        f"📱 Telefon: {h(data.get('booking_phone', ''))}",
-        f"📅 Sana: {h(data.get('booking_date', ''))}",
-    ])
+    price = listing.get("price_from")
+    text = BOOKING_CONFIRM_TEMPLATE.format_map({
+        "title": title_html,
+        "price_line": f"\n💰 {price:,} {listing.get('currency', 'UZS')}" if price else "",
+        "guest_count": guest_count,
+        "names": names_display,
+        "phone": h(data.get("booking_phone", "")),
+        "date": h(data.get("booking_date", "")),
+        "note_line": f"\n📝 Izoh: {h(note)}" if note else "",
+    })
     
-    if note:
-        lines.append(f"📝 Izoh: {h(note)}")
+    await safe_send(message, text, reply_markup=kb_booking_confirm(listing_id))
+
+
+CONFIRM_GUARD_TTL = 120  # seconds a confirmed booking blocks an identical re-press
+_recent_confirms: dict[tuple, float] = {}
+
+
+def _claim_confirm(key: tuple) -> bool:
+    """Mark a booking confirm as in progress; False if it was already claimed."""
+    now = time.monotonic()
+    if len(_recent_confirms) > 1000:
+        for k, ts in list(_recent_confirms.items()):
+            if now - ts >= CONFIRM_GUARD_TTL:
+                del _recent_confirms[k]
     
-    await safe_send(
-        message,
-        "\n".join(lines),
-        reply_markup=kb_booking_confirm(data.get("booking_listing_id", "")),
-    )
+    ts = _recent_confirms.get(key)
+    if ts is not None and now - ts < CONFIRM_GUARD_TTL:
+        return False
+    _recent_confirms[key] = now
+    return True
+
+
+def _release_confirm(key: tuple) -> None:
+    """Allow the same booking to be confirmed again (after a failed attempt)."""
+    _recent_confirms.pop(key, None)
 
 
 @user_flow_router.callback_query(F.data.startswith("uf:bconfirm:"))
 async def confirm_booking(callback: CallbackQuery, state: FSMContext, bot: Bot):
     """Confirm and submit booking."""
-    await callback.answer()
-    
     data = await state.get_data()
     listing_id = data.get("booking_listing_id")
-    listing = data.get("booking_listing", {})
     
-    if not listing_id:
+    # Double-click guard: the second press of the same booking is dropped
+    confirm_key = (
+        callback.from_user.id, listing_id,
+        data.get("booking_date"), data.get("guest_count"),
+    )
+    if not _claim_confirm(confirm_key):
+        await callback.answer("⏳ Bron allaqachon yuborilmoqda.")
+        return
+    
+    ack(callback)
+    
+    listing = await db.get_listing_cached(listing_id) if listing_id else None
+    
+    if not listing:
+        _release_confirm(confirm_key)
         await safe_edit(callback.message, "❌ Xatolik yuz berdi.")
         await state.clear()
         return
     
-    # Create booking
+    # Backpressure: hold the confirm (state kept) while the owner's DM queue is full
+    from booking_dispatch import owner_queue_depth, OWNER_QUEUE_LIMIT
+    owner_id = listing.get("owner_user_id") or listing.get("telegram_admin_id")
+    if owner_id and owner_queue_depth(owner_id) > OWNER_QUEUE_LIMIT:
+        _release_confirm(confirm_key)
+        await safe_send(
+            callback.message,
+            "⏳ Bu partner hozir band, iltimos biroz kutib qayta tasdiqlang.",
+        )
+        return
+    
+    # Create booking (owner is resolved from the listing in the same query)
     guest_names = data.get("guest_names", [])
-    owner_user_id = listing.get("owner_user_id") or listing.get("telegram_admin_id", 0)
     payload = {
         "guest_count": data.get("guest_count", 1),
         "guest_names": guest_names,
@@ -1200,38 +1314,30 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext, bot: Bot):
         "note": data.get("booking_note"),
     }
     
-    booking_id = await db.create_booking(
+    booking = await db.create_booking(
         listing_id=listing_id,
         user_telegram_id=callback.from_user.id,
         payload=payload,
         expires_minutes=5,
-        owner_user_id=owner_user_id,
     )
     
-    if not booking_id:
+    if not booking:
+        _release_confirm(confirm_key)
         await safe_edit(callback.message, "❌ Xatolik yuz berdi. Qaytadan urinib ko'ring.")
         await state.clear()
         return
     
-    # Dispatch to owner (partner) + admins
-    from booking_dispatch import dispatch_booking_to_owner, dispatch_booking_to_admins
-    success = await dispatch_booking_to_owner(bot, booking_id)
-    await dispatch_booking_to_admins(bot, booking_id)
+    # Dispatch to owner (partner) + admins in the background; if the owner
+    # turns out to be unreachable the user gets a follow-up message.
+    from booking_dispatch import schedule_booking_dispatch
+    schedule_booking_dispatch(bot, booking, callback.from_user.id)
     
-    if success:
-        await safe_edit(
-            callback.message,
-            "✅ <b>Bron yuborildi!</b>\n\n"
-            f"📌 {h(listing.get('title', ''))}\n\n"
-            "⏳ 5 daqiqa ichida javob keladi.\n"
-            "Agar javob kelmasa, keyinroq urinib ko'ring.",
-        )
-    else:
-        await safe_edit(
-            callback.message,
-            "⚠️ <b>Bron saqlandi</b>, lekin partnerni topmadik.\n\n"
-            "Tez orada siz bilan bog'lanamiz.",
-        )
+    await safe_edit(
+        callback.message,
+        BOOKING_SENT_TEMPLATE.format_map({
+            "title": data.get("booking_title_html") or h(listing.get("title", "")),
+        }),
+    )
     
     await state.clear()
 
@@ -1239,6 +1345,6 @@ async def confirm_booking(callback: CallbackQuery, state: FSMContext, bot: Bot):
 @user_flow_router.callback_query(F.data == "uf:bcancel")
 async def cancel_booking(callback: CallbackQuery, state: FSMContext):
     """Cancel booking form."""
-    await callback.answer()
     await state.clear()
+    ack(callback)
     await safe_edit(callback.message, "❌ Bron bekor qilindi.\n\nQayta ko'rish: /browse")
@@ -11,19 +11,23 @@ Railway + PostgreSQL (asyncpg)
 """
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from contextlib import suppress
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.fsm.context import FSMContext
 
 # Configuration — single source of truth
-from config import BOT_TOKEN, ADMINS
+from config import BOT_TOKEN, ADMINS, get_startup_info
 
 
 # Setup logging
@@ -32,6 +36,20 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
+
+# Log records are only enqueued on the event loop; a listener thread does
+# the actual stderr writes so slow I/O never blocks handlers.
+_root_logger = logging.getLogger()
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+# Flush queued records on every exit path (incl. sys.exit during startup);
+# the listener thread is a daemon and would otherwise be killed mid-queue.
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 # Import modules
@@ -39,6 +57,12 @@ import db_postgres as db
 from listing_wizard import listing_wizard_router
 from listings_user_flow import user_flow_router, start_registration, build_main_menu
 from booking_dispatch import booking_dispatch_router, start_timeout_checker, stop_timeout_checker
+from throttling import CallbackThrottleMiddleware
+
+
+# Abandoned browse/booking/wizard state expires from Redis after this much
+# inactivity (every FSM write refreshes it)
+FSM_TTL = 3600  # seconds
 
 
 def get_storage():
@@ -47,8 +71,23 @@ def get_storage():
     if redis_url:
         try:
             from aiogram.fsm.storage.redis import RedisStorage
+            from redis.asyncio import BlockingConnectionPool, Redis
             logger.info("Using Redis storage for FSM")
-            return RedisStorage.from_url(redis_url)
+            # One bounded client pool shared by all FSM reads/writes; when all
+            # connections are busy, callers wait for one (up to `timeout`)
+            # instead of failing with "Too many connections".
+            pool = BlockingConnectionPool.from_url(redis_url, max_connections=50, timeout=20)
+            kwargs = {
+                "state_ttl": FSM_TTL,
+                "data_ttl": FSM_TTL,
+            }
+            # orjson (optional) serializes FSM data several times faster
+            try:
+                import orjson
+                kwargs.update(json_loads=orjson.loads, json_dumps=orjson.dumps)
+            except ImportError:
+                pass
+            return RedisStorage(redis=Redis(connection_pool=pool), **kwargs)
         except Exception as e:
             logger.warning(f"Redis unavailable, using memory: {e}")
     return MemoryStorage()
@@ -57,7 +96,8 @@ def get_storage():
 async def main():
     """Main bot entry point."""
     logger.info("Starting Safar.uz Bot (Final Phase)...")
-    logger.info(f"Admins: {ADMINS}")
+    logger.info(get_startup_info())
+    logger.info(f"Admins: {sorted(ADMINS)}")
     
     # Initialize database
     if not await db.init_pool():
@@ -69,14 +109,21 @@ async def main():
         sys.exit(1)
     
     # Create bot and dispatcher
+    # One keep-alive pool for all Bot API calls; every connection goes to
+    # api.telegram.org, so `limit` is effectively the per-host cap.
+    # Default (100) queues requests during booking/broadcast bursts.
     bot = Bot(
         token=BOT_TOKEN,
+        session=AiohttpSession(limit=256),
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
     
     storage = get_storage()
     dp = Dispatcher(storage=storage)
     
+    # Per-user token bucket on inline button taps (before any handler runs)
+    dp.callback_query.outer_middleware(CallbackThrottleMiddleware())
+    
     # Register routers (order matters)
     dp.include_router(listing_wizard_router)    # /add, /my_listings
     dp.include_router(user_flow_router)         # /browse, booking flow
@@ -145,12 +192,14 @@ async def main():
         if message.from_user.id not in ADMINS:
             return
         
-        ok, msg = await db.healthcheck()
+        (ok, msg), listings_count, bookings_by_status = await asyncio.gather(
+            db.healthcheck(),
+            db.get_listings_count(),
+            db.get_bookings_by_status(),
+        )
         status = "✅" if ok else "❌"
-        
-        listings_count = await db.get_listings_count()
-        bookings_count = await db.get_bookings_count()
-        bookings_by_status = await db.get_bookings_by_status()
+        # Total falls out of the GROUP BY; no separate COUNT(*) scan
+        bookings_count = sum(bookings_by_status.values())
         
         lines = [
             "🏥 <b>HEALTH CHECK</b>",
@@ -195,6 +244,14 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop (optional, Linux/macOS) is a faster drop-in event loop
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
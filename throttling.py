@@ -0,0 +1,62 @@
+"""
+throttling.py - Per-user callback rate limiting
+
+Token bucket per Telegram user: short bursts of taps pass, sustained
+spam-clicking is answered with a toast and dropped before any handler
+(and its DB/Telegram calls) runs.
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_RATE = 1.0     # tokens refilled per second
+THROTTLE_BURST = 5      # bucket size (taps allowed back-to-back)
+_MAX_TRACKED_USERS = 10_000
+
+
+class CallbackThrottleMiddleware(BaseMiddleware):
+    """Drop callback queries from users exceeding THROTTLE_RATE (burst THROTTLE_BURST)."""
+
+    def __init__(self, rate: float = THROTTLE_RATE, burst: int = THROTTLE_BURST):
+        self.rate = rate
+        self.burst = burst
+        # user_id -> (tokens, last_refill)
+        self._buckets: dict[int, tuple[float, float]] = {}
+
+    def _allow(self, user_id: int) -> bool:
+        """Refill the user's bucket and try to take one token."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(user_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        allowed = tokens >= 1
+        self._buckets[user_id] = (tokens - 1 if allowed else tokens, now)
+
+        if len(self._buckets) > _MAX_TRACKED_USERS:
+            # Forget users whose bucket has fully refilled
+            idle = (self.burst - 1) / self.rate
+            self._buckets = {
+                uid: b for uid, b in self._buckets.items() if now - b[1] < idle
+            }
+        return allowed
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if isinstance(event, CallbackQuery) and event.from_user:
+            if not self._allow(event.from_user.id):
+                logger.debug("Throttled callback from user %s", event.from_user.id)
+                try:
+                    await event.answer("Juda tez! Biroz kuting...")
+                except Exception:
+                    pass
+                return None
+        return await handler(event, data)
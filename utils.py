@@ -0,0 +1,57 @@
+"""
+utils.py - Small helpers shared by the handler modules
+"""
+
+import asyncio
+import html
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fire-and-forget tasks (strong refs so they aren't GC'd mid-flight)
+_background_tasks: set[asyncio.Task] = set()
+
+
+# =============================================================================
+# HTML Safety
+# =============================================================================
+
+def h(text) -> str:
+    """HTML-escape any value."""
+    if type(text) is str:
+        return html.escape(text, quote=False) if text else ""
+    if text is None:
+        return ""
+    return html.escape(str(text), quote=False)
+
+
+# =============================================================================
+# Background Tasks
+# =============================================================================
+
+def _task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        exc = task.exception()
+        logger.error("Background task failed: %s", exc, exc_info=exc)
+
+
+def spawn(coro) -> asyncio.Task:
+    """Run a coroutine in the background, keeping a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_task_done)
+    return task
+
+
+async def _answer_quietly(callback) -> None:
+    """callback.answer(); an expired query is expected and only logged."""
+    try:
+        await callback.answer()
+    except Exception as e:
+        logger.debug("callback.answer failed: %s", e)
+
+
+def ack(callback) -> None:
+    """Answer the callback in the background instead of before the handler's real work."""
+    spawn(_answer_quietly(callback))